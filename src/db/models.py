@@ -3,13 +3,42 @@ SQLModel definitions for trading journal.
 Session-only in-memory SQLite (no auth, no persistence).
 """
 
-from datetime import datetime, date, timezone
+from datetime import datetime, date, timedelta, timezone
 from typing import Optional, List
+from zoneinfo import ZoneInfo
 import uuid
-import pytz
 
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import SQLModel, Field, Relationship
 
+_SG = ZoneInfo("Asia/Singapore")
+_EPOCH = datetime(1970, 1, 1)
+
+
+class EpochMicros(TypeDecorator):
+    """
+    Naive-UTC datetime stored as BIGINT microseconds since the Unix epoch.
+
+    Binds are plain integers (no ISO string formatting/parsing) and range
+    comparisons/ORDER BY on the column are integer compares.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = value - _EPOCH
+        return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return _EPOCH + timedelta(microseconds=value)
+
 
 class Account(SQLModel, table=True):
     """IBKR Account (one per uploaded report in this MVP)."""
@@ -18,22 +47,26 @@ class Account(SQLModel, table=True):
     currency: str = Field(default="USD")
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    executions: List["Execution"] = Relationship(back_populates="account", cascade_delete=True)
-    trades: List["Trade"] = Relationship(back_populates="account", cascade_delete=True)
+    executions: List["Execution"] = Relationship(
+        back_populates="account", cascade_delete=True, passive_deletes=True
+    )
+    trades: List["Trade"] = Relationship(
+        back_populates="account", cascade_delete=True, passive_deletes=True
+    )
 
 
 class Execution(SQLModel, table=True):
     """Individual trade execution (buy/sell) from IBKR Flex Query."""
     __tablename__ = "execution"
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    account_id: str = Field(foreign_key="account.id", index=True)
+    id: Optional[int] = Field(default=None, primary_key=True)  # integer rowid: compact, insert-ordered
+    account_id: str = Field(foreign_key="account.id", ondelete="CASCADE", index=True)
 
     ib_execution_id: str = Field(index=True)  # Trade ID from IBKR
     conid: Optional[int] = Field(default=None, index=True)
     symbol: str = Field(index=True)
 
-    ts_utc: datetime = Field(index=True)  # stored as naive UTC
+    ts_utc: datetime = Field(sa_type=EpochMicros, index=True)  # naive UTC, stored as epoch micros
     ts_raw: str = Field()  # raw string from IBKR
 
     side: str = Field()  # BUY or SELL
@@ -50,11 +83,15 @@ class Execution(SQLModel, table=True):
         __import__("sqlalchemy").UniqueConstraint(
             "account_id", "ib_execution_id", name="uq_account_ib_exec"
         ),
+        # Reconstruction scan: one account, instrument by instrument, in time order
+        __import__("sqlalchemy").Index(
+            "ix_exe_acct_instr_ts", "account_id", "conid", "symbol", "ts_utc", "ib_execution_id"
+        ),
     )
 
     account: Account = Relationship(back_populates="executions")
     trade_executions: List["TradeExecution"] = Relationship(
-        back_populates="execution", cascade_delete=True
+        back_populates="execution", cascade_delete=True, passive_deletes=True
     )
 
     @property
@@ -65,8 +102,7 @@ class Execution(SQLModel, table=True):
     @property
     def ts_sg(self):
         """ts_utc converted to Asia/Singapore."""
-        sg = pytz.timezone("Asia/Singapore")
-        return self.ts_utc_aware.astimezone(sg)
+        return self.ts_utc_aware.astimezone(_SG)
 
 
 class Trade(SQLModel, table=True):
@@ -74,7 +110,7 @@ class Trade(SQLModel, table=True):
     __tablename__ = "trade"
 
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    account_id: str = Field(foreign_key="account.id", index=True)
+    account_id: str = Field(foreign_key="account.id", ondelete="CASCADE", index=True)
 
     symbol: str = Field(index=True)
     conid: Optional[int] = Field(default=None, index=True)
@@ -97,26 +133,44 @@ class Trade(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    __table_args__ = (
+        # Covers the per-account "ORDER BY opened_at_utc" list/month queries.
+        __import__("sqlalchemy").Index("ix_trade_acct_opened", "account_id", "opened_at_utc"),
+        # Every closed-trade metric filters on (account_id, status).
+        __import__("sqlalchemy").Index("ix_trade_account_status", "account_id", "status"),
+        # Trades-list symbol choices (DISTINCT symbol) and symbol filter.
+        __import__("sqlalchemy").Index("ix_trade_acct_symbol", "account_id", "symbol"),
+    )
+
     account: Account = Relationship(back_populates="trades")
     trade_executions: List["TradeExecution"] = Relationship(
-        back_populates="trade", cascade_delete=True
+        back_populates="trade", cascade_delete=True, passive_deletes=True
+    )
+    trade_days: List["TradeDay"] = Relationship(
+        back_populates="trade", cascade_delete=True, passive_deletes=True
+    )
+    tags: List["TradeTag"] = Relationship(
+        back_populates="trade", cascade_delete=True, passive_deletes=True
     )
-    trade_days: List["TradeDay"] = Relationship(back_populates="trade", cascade_delete=True)
-    tags: List["TradeTag"] = Relationship(back_populates="trade", cascade_delete=True)
 
 
 class TradeExecution(SQLModel, table=True):
     """Link between Trade and Execution (how much from each exec went to this trade)."""
     __tablename__ = "trade_execution"
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    trade_id: str = Field(foreign_key="trade.id", index=True)
-    execution_id: str = Field(foreign_key="execution.id", index=True)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    trade_id: str = Field(foreign_key="trade.id", ondelete="CASCADE", index=True)
+    execution_id: int = Field(foreign_key="execution.id", ondelete="CASCADE", index=True)
 
     signed_qty: float = Field()
     role: str = Field()  # "open" or "close"
     lot_match_group: Optional[str] = Field(default=None)
 
+    __table_args__ = (
+        # Opening-fill lookups per trade (price buckets) filter on (trade_id, role).
+        __import__("sqlalchemy").Index("ix_tx_trade_role", "trade_id", "role"),
+    )
+
     trade: Trade = Relationship(back_populates="trade_executions")
     execution: Execution = Relationship(back_populates="trade_executions")
 
@@ -125,8 +179,8 @@ class TradeDay(SQLModel, table=True):
     """Daily P&L summary for a trade (multi-day partial closes)."""
     __tablename__ = "trade_day"
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    trade_id: str = Field(foreign_key="trade.id", index=True)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    trade_id: str = Field(foreign_key="trade.id", ondelete="CASCADE", index=True)
 
     day_date_local: date = Field(index=True)  # date in report_timezone
     day_status: str = Field()  # "opened", "adjusted", "closed"
@@ -137,6 +191,11 @@ class TradeDay(SQLModel, table=True):
 
     shares_closed: float = Field(default=0.0)
 
+    __table_args__ = (
+        # Lets day-range scans (calendar, equity curve) stay inside the index.
+        __import__("sqlalchemy").Index("ix_tradeday_trade_date", "trade_id", "day_date_local"),
+    )
+
     trade: Trade = Relationship(back_populates="trade_days")
 
 
@@ -145,14 +204,16 @@ class Tag(SQLModel, table=True):
     __tablename__ = "tag"
 
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    account_id: str = Field(foreign_key="account.id", index=True)
+    account_id: str = Field(foreign_key="account.id", ondelete="CASCADE", index=True)
     name: str = Field()
 
     __table_args__ = (
         __import__("sqlalchemy").UniqueConstraint("account_id", "name", name="uq_account_tag"),
     )
 
-    trade_tags: List["TradeTag"] = Relationship(back_populates="tag", cascade_delete=True)
+    trade_tags: List["TradeTag"] = Relationship(
+        back_populates="tag", cascade_delete=True, passive_deletes=True
+    )
 
 
 class TradeTag(SQLModel, table=True):
@@ -160,8 +221,8 @@ class TradeTag(SQLModel, table=True):
     __tablename__ = "trade_tag"
 
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    trade_id: str = Field(foreign_key="trade.id", index=True)
-    tag_id: str = Field(foreign_key="tag.id", index=True)
+    trade_id: str = Field(foreign_key="trade.id", ondelete="CASCADE", index=True)
+    tag_id: str = Field(foreign_key="tag.id", ondelete="CASCADE", index=True)
 
     __table_args__ = (
         __import__("sqlalchemy").UniqueConstraint("trade_id", "tag_id", name="uq_trade_tag"),
@@ -2,19 +2,32 @@
 """Per-session in-memory DB for Streamlit (no persistence)."""
 
 import streamlit as st
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine
 
 _ENGINE_KEY = "db_engine"
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # In-memory DB: WAL/synchronous/mmap don't apply, but a larger page cache
+    # and in-memory temp B-trees (GROUP BY / ORDER BY sorts) still help.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 def _new_engine():
-    return create_engine(
+    engine = create_engine(
         "sqlite://",  # in-memory
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,  # keep one connection; DB survives while engine exists
         echo=False,
     )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
 
 
 def reset_db():
@@ -2,9 +2,10 @@
 """Metrics and reporting calculations."""
 
 from typing import Dict
+from sqlalchemy import case, func
 from sqlmodel import Session, select
-from datetime import datetime, timedelta, timezone, date
-import pytz
+from datetime import date
+import numpy as np
 import pandas as pd
 
 from src.db.models import Trade, TradeDay, Execution, TradeExecution
@@ -27,54 +28,42 @@ class MetricsCalculator:
         """
 
         stmt = (
-            select(TradeDay)
+            select(
+                TradeDay.day_date_local,
+                func.sum(TradeDay.realized_gross),
+                func.sum(TradeDay.commissions),
+            )
             .join(Trade)
             .where(Trade.account_id == account_id)
+            .group_by(TradeDay.day_date_local)
             .order_by(TradeDay.day_date_local)
         )
-        trade_days = session.exec(stmt).all()
+        per_day = session.exec(stmt).all()
 
-        if not trade_days:
+        if not per_day:
             return pd.DataFrame(
                 columns=["date", "daily_pnl", "cumulative_pnl", "drawdown", "daily_gross"]
             )
 
-        by_day = {}
-        for td in trade_days:
-            if td.day_date_local not in by_day:
-                by_day[td.day_date_local] = []
-            by_day[td.day_date_local].append(td)
-
-        rows = []
-        cumulative = 0.0
-        peak = 0.0
-
-        for day_date in sorted(by_day.keys()):
-            items = by_day[day_date]
-
-            daily_gross = sum(td.realized_gross for td in items)
-            daily_commissions = sum(td.commissions for td in items)
-
-            if use_gross:
-                daily_pnl = daily_gross
-            else:
-                daily_pnl = daily_gross + daily_commissions
-
-            cumulative += daily_pnl
-            peak = max(peak, cumulative)
-            drawdown = cumulative - peak
-
-            rows.append(
-                {
-                    "date": day_date,
-                    "daily_pnl": daily_pnl,
-                    "daily_gross": daily_gross,
-                    "cumulative_pnl": cumulative,
-                    "drawdown": drawdown,
-                }
-            )
-
-        return pd.DataFrame(rows)
+        # Rows arrive grouped and date-ordered; fill typed arrays in one pass each
+        n = len(per_day)
+        dates = [d for d, _, _ in per_day]
+        daily_gross = np.fromiter((g for _, g, _ in per_day), dtype=np.float64, count=n)
+        daily_comm = np.fromiter((c for _, _, c in per_day), dtype=np.float64, count=n)
+
+        daily_pnl = daily_gross if use_gross else daily_gross + daily_comm
+        cumulative = np.cumsum(daily_pnl)
+        peak = np.maximum.accumulate(np.maximum(cumulative, 0.0))  # the running peak starts at 0
+
+        return pd.DataFrame(
+            {
+                "date": dates,
+                "daily_pnl": daily_pnl,
+                "daily_gross": daily_gross,
+                "cumulative_pnl": cumulative,
+                "drawdown": cumulative - peak,
+            }
+        )
 
     @staticmethod
     def get_daily_summary(
@@ -84,26 +73,27 @@ class MetricsCalculator:
     ) -> Dict:
         """Get summary metrics for a specific day."""
         stmt = (
-            select(TradeDay)
+            select(
+                func.coalesce(func.sum(TradeDay.realized_gross), 0.0),
+                func.coalesce(func.sum(TradeDay.commissions), 0.0),
+                func.coalesce(func.sum(TradeDay.realized_net), 0.0),
+                func.coalesce(func.sum(TradeDay.shares_closed), 0.0),
+                func.count(func.distinct(TradeDay.trade_id)),
+            )
             .join(Trade)
             .where(
                 Trade.account_id == account_id,
                 TradeDay.day_date_local == day_date,
             )
         )
-        trade_days = session.exec(stmt).all()
-
-        gross = sum(td.realized_gross for td in trade_days)
-        commissions = sum(td.commissions for td in trade_days)
-        net = sum(td.realized_net for td in trade_days)
-        shares_closed = sum(td.shares_closed for td in trade_days)
+        gross, commissions, net, shares_closed, trades_count = session.exec(stmt).one()
 
         return {
             "date": day_date,
             "gross_pnl": gross,
             "commissions": commissions,
             "net_pnl": net,
-            "trades_count": len({td.trade_id for td in trade_days}),
+            "trades_count": trades_count,
             "shares_closed": shares_closed,
         }
 
@@ -114,13 +104,37 @@ class MetricsCalculator:
         use_gross: bool = False,
     ) -> Dict:
         """Get overall trading statistics."""
-        stmt = select(Trade).where(
+        is_win = Trade.net_pnl_total > 0
+        is_loss = Trade.net_pnl_total < 0
+        stmt = select(
+            func.count(),
+            func.sum(case((is_win, 1), else_=0)),
+            func.sum(case((is_loss, 1), else_=0)),
+            func.sum(Trade.gross_pnl_total),
+            func.sum(Trade.commission_total),
+            func.sum(Trade.net_pnl_total),
+            func.sum(case((is_win, Trade.gross_pnl_total), else_=0.0)),
+            func.sum(case((is_loss, func.abs(Trade.gross_pnl_total)), else_=0.0)),
+            func.sum(case((is_win, Trade.net_pnl_total), else_=0.0)),
+            func.sum(case((is_loss, Trade.net_pnl_total), else_=0.0)),
+        ).where(
             Trade.account_id == account_id,
             Trade.status == "closed",
         )
-        closed_trades = session.exec(stmt).all()
-
-        if not closed_trades:
+        (
+            total_trades,
+            wins,
+            losses,
+            total_gross,
+            total_commissions,
+            total_net,
+            gross_wins,
+            gross_losses,
+            net_wins,
+            net_losses,
+        ) = session.exec(stmt).one()
+
+        if not total_trades:
             return {
                 "total_trades": 0,
                 "winning_trades": 0,
@@ -134,28 +148,18 @@ class MetricsCalculator:
                 "profit_factor": 0.0,
             }
 
-        wins = [t for t in closed_trades if t.net_pnl_total > 0]
-        losses = [t for t in closed_trades if t.net_pnl_total < 0]
-
-        total_gross = sum(t.gross_pnl_total for t in closed_trades)
-        total_commissions = sum(t.commission_total for t in closed_trades)
-        total_net = sum(t.net_pnl_total for t in closed_trades)
-
-        gross_wins = sum(t.gross_pnl_total for t in wins)
-        gross_losses = sum(abs(t.gross_pnl_total) for t in losses)
-
         profit_factor = gross_wins / gross_losses if gross_losses > 0 else 0.0
 
         return {
-            "total_trades": len(closed_trades),
-            "winning_trades": len(wins),
-            "losing_trades": len(losses),
-            "win_rate": len(wins) / len(closed_trades) if closed_trades else 0.0,
+            "total_trades": total_trades,
+            "winning_trades": wins,
+            "losing_trades": losses,
+            "win_rate": wins / total_trades,
             "total_gross": total_gross,
             "total_commissions": total_commissions,
             "total_net": total_net,
-            "avg_win": sum(t.net_pnl_total for t in wins) / len(wins) if wins else 0.0,
-            "avg_loss": sum(t.net_pnl_total for t in losses) / len(losses) if losses else 0.0,
+            "avg_win": net_wins / wins if wins else 0.0,
+            "avg_loss": net_losses / losses if losses else 0.0,
             "profit_factor": profit_factor,
         }
 
@@ -165,41 +169,29 @@ class MetricsCalculator:
         account_id: str,
     ) -> pd.DataFrame:
         """Get performance by instrument."""
-        stmt = select(Trade).where(
-            Trade.account_id == account_id,
-            Trade.status == "closed",
-        )
-        trades = session.exec(stmt).all()
-
-        by_symbol = {}
-        for trade in trades:
-            key = trade.symbol
-            if key not in by_symbol:
-                by_symbol[key] = []
-            by_symbol[key].append(trade)
-
-        rows = []
-        for symbol, symbol_trades in sorted(by_symbol.items()):
-            gross = sum(t.gross_pnl_total for t in symbol_trades)
-            commissions = sum(t.commission_total for t in symbol_trades)
-            net = sum(t.net_pnl_total for t in symbol_trades)
-
-            wins = len([t for t in symbol_trades if t.net_pnl_total > 0])
-            total = len(symbol_trades)
-
-            rows.append(
-                {
-                    "symbol": symbol,
-                    "count": total,
-                    "wins": wins,
-                    "win_rate": wins / total if total > 0 else 0.0,
-                    "gross_pnl": gross,
-                    "commissions": commissions,
-                    "net_pnl": net,
-                }
+        stmt = (
+            select(
+                Trade.symbol,
+                func.count(),
+                func.sum(case((Trade.net_pnl_total > 0, 1), else_=0)),
+                func.sum(Trade.gross_pnl_total),
+                func.sum(Trade.commission_total),
+                func.sum(Trade.net_pnl_total),
             )
+            .where(
+                Trade.account_id == account_id,
+                Trade.status == "closed",
+            )
+            .group_by(Trade.symbol)
+            .order_by(Trade.symbol)
+        )
+        rows = session.exec(stmt).all()
 
-        return pd.DataFrame(rows)
+        df = pd.DataFrame.from_records(
+            rows, columns=["symbol", "count", "wins", "gross_pnl", "commissions", "net_pnl"]
+        )
+        df.insert(3, "win_rate", df["wins"] / df["count"])
+        return df
 
     @staticmethod
     def get_entry_time_of_day_stats(
@@ -209,38 +201,32 @@ class MetricsCalculator:
         use_gross: bool = False,
     ) -> pd.DataFrame:
         """Closed-trade performance grouped by ENTRY hour in report timezone."""
-        tz = pytz.timezone(report_timezone)
-
-        trades = session.exec(
-            select(Trade).where(
+        pnl_col = Trade.gross_pnl_total if use_gross else Trade.net_pnl_total
+        rows = session.exec(
+            select(Trade.opened_at_utc, pnl_col).where(
                 Trade.account_id == account_id,
                 Trade.status == "closed",
             )
         ).all()
 
-        if not trades:
+        if not rows:
             return pd.DataFrame(
                 columns=["hour", "trades", "pnl_sum", "pnl_avg", "win_rate"]
             )
 
-        rows = []
-        for t in trades:
-            entry_utc_aware = t.opened_at_utc.replace(tzinfo=timezone.utc)
-            entry_local = entry_utc_aware.astimezone(tz)
-            hour = entry_local.hour
-            pnl = t.gross_pnl_total if use_gross else t.net_pnl_total
-            rows.append({"hour": hour, "pnl": pnl, "is_win": 1 if pnl > 0 else 0})
+        # opened_at_utc is naive UTC; localize and convert the whole column at once
+        df = pd.DataFrame.from_records(rows, columns=["opened_at_utc", "pnl"])
+        df["hour"] = pd.to_datetime(df["opened_at_utc"], utc=True).dt.tz_convert(report_timezone).dt.hour
+        df["is_win"] = (df["pnl"] > 0).astype(np.int8)
 
-        df = pd.DataFrame(rows)
         out = (
-            df.groupby("hour", as_index=False)
+            df.groupby("hour", as_index=False, sort=True)
             .agg(
                 trades=("pnl", "count"),
                 pnl_sum=("pnl", "sum"),
                 pnl_avg=("pnl", "mean"),
                 win_rate=("is_win", "mean"),
             )
-            .sort_values("hour")
         )
         return out
 
@@ -257,64 +243,50 @@ class MetricsCalculator:
         if bucket_edges is None:
             bucket_edges = [0, 5, 10, 20, 50, 100, 200, 500, 1000, 10_000]
 
-        trades = session.exec(
-            select(Trade).where(
-                Trade.account_id == account_id,
-                Trade.status == "closed",
-            )
-        ).all()
-
-        if not trades:
-            return pd.DataFrame(
-                columns=["price_bucket", "trades", "pnl_sum", "pnl_avg"]
-            )
-
-        trade_ids = [t.id for t in trades]
-        trade_map = {t.id: t for t in trades}
-
+        # Opening fills of closed trades, with each trade's P&L, in one join
+        pnl_col = Trade.gross_pnl_total if use_gross else Trade.net_pnl_total
         rows = session.exec(
-            select(TradeExecution, Execution)
+            select(TradeExecution.trade_id, Execution.price, TradeExecution.signed_qty, pnl_col)
             .join(Execution, TradeExecution.execution_id == Execution.id)
+            .join(Trade, Trade.id == TradeExecution.trade_id)
             .where(
-                TradeExecution.trade_id.in_(trade_ids),
+                Trade.account_id == account_id,
+                Trade.status == "closed",
                 TradeExecution.role == "open",
             )
         ).all()
 
-        accum = {}  # trade_id -> (notional_sum, qty_sum)
-        for te, exe in rows:
-            qty = abs(te.signed_qty)
-            if qty == 0:
-                continue
-            notional = exe.price * qty
-            n, q = accum.get(te.trade_id, (0.0, 0.0))
-            accum[te.trade_id] = (n + notional, q + qty)
-
-        out_rows = []
-        for trade_id, (notional_sum, qty_sum) in accum.items():
-            if qty_sum <= 0:
-                continue
-            avg_entry = notional_sum / qty_sum
-            t = trade_map[trade_id]
-            pnl = t.gross_pnl_total if use_gross else t.net_pnl_total
-            out_rows.append({"avg_entry": avg_entry, "pnl": pnl})
+        # Quantity-weighted average entry price per trade
+        df_open = pd.DataFrame.from_records(rows, columns=["trade_id", "price", "signed_qty", "pnl"])
+        df_open["qty"] = df_open["signed_qty"].abs()
+        df_open["notional"] = df_open["price"] * df_open["qty"]
+        agg = df_open.groupby("trade_id").agg(
+            notional_sum=("notional", "sum"), qty_sum=("qty", "sum"), pnl=("pnl", "first")
+        )
+        agg = agg[agg["qty_sum"] > 0]
 
-        df = pd.DataFrame(out_rows)
+        df = pd.DataFrame(
+            {
+                "avg_entry": agg["notional_sum"] / agg["qty_sum"],
+                "pnl": agg["pnl"],
+            }
+        )
         if df.empty:
             return pd.DataFrame(
                 columns=["price_bucket", "trades", "pnl_sum", "pnl_avg"]
             )
 
+        # pd.cut yields an ordered categorical; observed=True groups only the
+        # buckets that actually have trades and keeps them in bucket order.
         df["price_bucket"] = pd.cut(
             df["avg_entry"], bins=bucket_edges, right=False, include_lowest=True
         )
         agg = (
-            df.groupby("price_bucket", as_index=False)
+            df.groupby("price_bucket", observed=True, sort=True, as_index=False)
             .agg(
                 trades=("pnl", "count"),
                 pnl_sum=("pnl", "sum"),
                 pnl_avg=("pnl", "mean"),
             )
-            .sort_values("price_bucket")
         )
         return agg
@@ -1,31 +1,125 @@
 # src/domain/models.py
 """Domain value objects."""
 
-from typing import Optional, Deque
-from collections import deque
+from typing import Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
 
+import numpy as np
 
-@dataclass
-class OpenLot:
-    """Represents an open lot (for FIFO matching)."""
-    qty: float
-    price: float
-    exe_id: str
+_INITIAL_LOT_CAPACITY = 8
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionState:
-    """Tracks current position for an instrument during reconstruction."""
-    current_trade_id: Optional[str] = None
-    current_signed_qty: float = 0.0  # Positive for LONG, negative for SHORT
-    opened_at: Optional[datetime] = None
-    open_lots: Deque[OpenLot] = field(default_factory=deque)
-    
-    def reset(self):
-        """Reset position state."""
-        self.current_trade_id = None
-        self.current_signed_qty = 0.0
-        self.opened_at = None
-        self.open_lots = deque()
+    """
+    Tracks current position for an instrument during reconstruction.
+
+    Open lots are stored FIFO as parallel arrays (qty/price) between
+    `head` and `tail`; consuming the oldest lot just advances `head`.
+    """
+    lot_qty: np.ndarray = field(default_factory=lambda: np.empty(_INITIAL_LOT_CAPACITY))
+    lot_price: np.ndarray = field(default_factory=lambda: np.empty(_INITIAL_LOT_CAPACITY))
+    head: int = 0
+    tail: int = 0
+    open_qty: float = 0.0  # running total of lot_qty[head:tail]
+
+    @classmethod
+    def with_capacity(cls, capacity: int) -> "PositionState":
+        """
+        Pre-size the lot arrays. Each execution opens at most one lot, so a
+        capacity of len(executions) means the book never has to grow.
+        """
+        capacity = max(capacity, 1)
+        return cls(lot_qty=np.empty(capacity), lot_price=np.empty(capacity))
+
+    @property
+    def has_lots(self) -> bool:
+        return self.tail > self.head
+
+    def append_lot(self, qty: float, price: float):
+        """Push a new lot at the back of the FIFO queue."""
+        if self.tail == len(self.lot_qty):
+            self._grow()
+        self.lot_qty[self.tail] = qty
+        self.lot_price[self.tail] = price
+        self.tail += 1
+        self.open_qty += qty
+
+    def consume(self, qty: float) -> Tuple[float, float]:
+        """
+        Close up to `qty` from the oldest lots (FIFO).
+
+        Returns:
+            (matched_qty, matched_cost) where matched_cost = sum(lot_price * matched)
+        """
+        head, tail = self.head, self.tail
+        if qty <= 0 or head == tail:
+            return 0.0, 0.0
+
+        q = self.lot_qty[head:tail]
+        p = self.lot_price[head:tail]
+
+        # Closing the whole book: take every lot outright. This also absorbs any
+        # rounding drift between the running open_qty and the lots themselves.
+        if qty >= self.open_qty:
+            matched = float(q.sum())
+            cost = float(np.dot(q, p))
+            self._clear_lots()
+            return matched, cost
+
+        # Most partial closes fit inside the oldest lot: plain scalar arithmetic.
+        first = float(q[0])
+        if qty <= first:
+            cost = qty * float(p[0])
+            if qty < first:
+                q[0] = first - qty
+            elif head + 1 == tail:
+                self._clear_lots()
+                return qty, cost
+            else:
+                self.head = head + 1
+            self.open_qty -= qty
+            return qty, cost
+
+        cum = np.cumsum(q)
+
+        # Lots whose running total fits inside qty are consumed entirely.
+        full = int(np.searchsorted(cum, qty, side="right"))
+        matched = float(cum[full - 1]) if full else 0.0
+        cost = float(np.dot(q[:full], p[:full])) if full else 0.0
+
+        # The next lot (if any) is only partially consumed.
+        rest = qty - matched
+        if full < len(q) and rest > 0:
+            q[full] -= rest  # q is a view; writes through to lot_qty
+            matched += rest
+            cost += rest * float(p[full])
+
+        self.head = head + full
+        if self.head == self.tail:
+            self._clear_lots()
+        else:
+            self.open_qty -= matched
+        return matched, cost
+
+    def _grow(self):
+        """Compact live lots to the front; double capacity if still mostly full."""
+        live = self.tail - self.head
+        capacity = len(self.lot_qty)
+        if live * 2 >= capacity:
+            capacity *= 2
+
+        lot_qty = np.empty(capacity)
+        lot_price = np.empty(capacity)
+        lot_qty[:live] = self.lot_qty[self.head:self.tail]
+        lot_price[:live] = self.lot_price[self.head:self.tail]
+
+        self.lot_qty = lot_qty
+        self.lot_price = lot_price
+        self.head = 0
+        self.tail = live
+
+    def _clear_lots(self):
+        self.head = 0
+        self.tail = 0
+        self.open_qty = 0.0
@@ -2,18 +2,43 @@
 """Trade reconstruction from executions using FIFO matching."""
 
 from typing import List, Tuple, Optional
-from datetime import datetime, date, timezone
-from collections import defaultdict, deque
-import pytz
+from datetime import datetime, date, time, timedelta, timezone
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
+from zoneinfo import ZoneInfo
+import multiprocessing
+import os
+import uuid
 
+from sqlalchemy import delete, func, insert
 from sqlmodel import Session, select
-from src.db.models import Execution, Trade, TradeExecution, TradeDay
-from src.domain.models import PositionState, OpenLot
+from src.db.models import Execution, Trade, TradeExecution, TradeDay, TradeTag
+from src.domain.models import PositionState
+
+# Below this many executions a process pool costs more to start than it saves.
+_PARALLEL_MIN_EXECUTIONS = 50_000
+# Each worker holds its instruments' rows in memory; keep small hosts safe.
+_MAX_WORKERS = 4
+
+# Weekend fills book to the preceding Friday, indexed by date.weekday().
+_WEEKEND_ROLLBACK = (timedelta(0),) * 5 + (timedelta(days=-1), timedelta(days=-2))
+
+# Trade direction by sign (+1 BUY/LONG, -1 SELL/SHORT); only written rows carry the string.
+_DIRECTIONS = {1.0: "LONG", -1.0: "SHORT"}
+
+
+def _usable_cpus() -> int:
+    """CPUs this process may run on, not the host's total (honours affinity limits)."""
+    if hasattr(os, "process_cpu_count"):  # Python 3.13+
+        return os.process_cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
 
 
 class TradeReconstructor:
     """Reconstructs trades from executions using FIFO matching."""
-    
+
     @staticmethod
     def reconstruct_for_account(
         session: Session,
@@ -23,314 +48,317 @@ class TradeReconstructor:
         """
         Full reconstruction of trades from executions.
         Idempotent: deletes existing trades and rebuilds.
-        
+
         Returns:
             (trades_created, trade_days_created)
         """
-        tz = pytz.timezone(report_timezone)
-        
-        # Delete existing trades (cascades to trade_executions, trade_days, trade_tags)
-        stmt = select(Trade).where(Trade.account_id == account_id)
-        existing_trades = session.exec(stmt).all()
-        for trade in existing_trades:
-            session.delete(trade)
+        tz = ZoneInfo(report_timezone)  # ZoneInfo caches instances per key
+
+        # Delete existing trades with set-based DELETEs. Children are removed
+        # explicitly so this does not depend on SQLite's foreign_keys pragma.
+        account_trades = select(Trade.id).where(Trade.account_id == account_id)
+        for child in (TradeExecution, TradeDay, TradeTag):
+            session.exec(
+                delete(child)
+                .where(child.trade_id.in_(account_trades))
+                .execution_options(synchronize_session=False)
+            )
+        session.exec(
+            delete(Trade)
+            .where(Trade.account_id == account_id)
+            .execution_options(synchronize_session=False)
+        )
         session.commit()
-        
-        # Get all executions sorted by time
-        stmt = select(Execution).where(
-            Execution.account_id == account_id
-        ).order_by(Execution.ts_utc, Execution.ib_execution_id)
-        
-        executions = session.exec(stmt).all()
-        
-        if not executions:
+
+        n_executions = session.exec(
+            select(func.count()).select_from(Execution).where(Execution.account_id == account_id)
+        ).one()
+        if not n_executions:
             return 0, 0
-        
-        # Group by instrument (conid or symbol)
-        by_instrument = defaultdict(list)
-        for exe in executions:
-            key = (exe.conid, exe.symbol) if exe.conid else (None, exe.symbol)
-            by_instrument[key].append(exe)
-        
-        trades_created = 0
-        trade_days_created = 0
-        
-        # Reconstruct per instrument
-        for (conid, symbol), exes in by_instrument.items():
-            num_trades, num_days = TradeReconstructor._reconstruct_instrument(
-                session=session,
-                account_id=account_id,
-                conid=conid,
-                symbol=symbol,
-                executions=exes,
-                tz=tz,
-            )
-            trades_created += num_trades
-            trade_days_created += num_days
-        
+
+        # Executions grouped by instrument, time-ordered within each (plain
+        # columns; the matcher never needs ORM rows)
+        stmt = select(
+            Execution.conid,
+            Execution.symbol,
+            Execution.id,
+            Execution.ts_utc,
+            Execution.side,
+            Execution.quantity,
+            Execution.price,
+            Execution.commission,
+        ).where(
+            Execution.account_id == account_id
+        ).order_by(Execution.conid, Execution.symbol, Execution.ts_utc, Execution.ib_execution_id)
+
+        # Stream rows in batches and cut them into per-instrument runs as they
+        # arrive; on the sequential path each instrument is matched before the
+        # next one is fetched.
+        rows = session.exec(stmt.execution_options(yield_per=10_000))
+        jobs = (
+            (account_id, conid, symbol, [tuple(row[2:]) for row in group], tz)
+            for (conid, symbol), group in groupby(rows, key=lambda row: (row[0] or None, row[1]))
+        )
+
+        # Instruments are independent, so large accounts are matched in parallel.
+        # Workers are spawned, not forked: forking the threaded Streamlit server
+        # can deadlock the child.
+        workers = min(_usable_cpus(), _MAX_WORKERS)
+        if workers > 1 and n_executions >= _PARALLEL_MIN_EXECUTIONS:
+            jobs = list(jobs)
+            with ProcessPoolExecutor(
+                max_workers=min(len(jobs), workers),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                results = list(pool.map(TradeReconstructor._reconstruct_instrument, *zip(*jobs)))
+        else:
+            results = (TradeReconstructor._reconstruct_instrument(*job) for job in jobs)
+
+        trade_rows: List[dict] = []
+        trade_exec_rows: List[dict] = []
+        trade_day_rows: List[dict] = []
+        for trades, trade_execs, trade_days in results:
+            trade_rows.extend(trades)
+            trade_exec_rows.extend(trade_execs)
+            trade_day_rows.extend(trade_days)
+
+        # The rows are plain dicts, so bypass the ORM bulk-insert layer and
+        # executemany straight into the tables on the session's connection
+        # (same transaction). Trades first so the link/day rows' foreign keys resolve.
+        conn = session.connection()
+        for model, rows in ((Trade, trade_rows), (TradeExecution, trade_exec_rows), (TradeDay, trade_day_rows)):
+            if rows:
+                conn.execute(insert(model.__table__), rows)
+
         session.commit()
-        return trades_created, trade_days_created
-    
+        return len(trade_rows), len(trade_day_rows)
+
     @staticmethod
-    def _add_trade_execution(session: Session, trade_id: str, execution_id: str, signed_qty: float, role: str):
+    def _add_trade_execution(rows: list, trade_id: str, execution_id: int, signed_qty: float, role: str):
         if signed_qty is None:
             raise ValueError(f"signed_qty is None for trade_id={trade_id}, execution_id={execution_id}, role={role}")
         if signed_qty == 0:
             return
-        session.add(
-            TradeExecution(
-                trade_id=trade_id,
-                execution_id=execution_id,
-                signed_qty=float(signed_qty),
-                role=role,
-            )
+        rows.append(
+            {
+                "trade_id": trade_id,
+                "execution_id": execution_id,
+                "signed_qty": float(signed_qty),
+                "role": role,
+            }
         )
 
+    @staticmethod
+    def _new_trade(
+        account_id: str,
+        conid: Optional[int],
+        symbol: str,
+        direction: str,
+        opened_at_utc: datetime,
+        quantity: float,
+        commission: float,
+    ) -> dict:
+        """A Trade row as a dict, with its UUID assigned client-side."""
+        now = datetime.utcnow()
+        return {
+            "id": str(uuid.uuid4()),
+            "account_id": account_id,
+            "symbol": symbol,
+            "conid": conid,
+            "direction": direction,
+            "opened_at_utc": opened_at_utc,
+            "closed_at_utc": None,
+            "status": "open",
+            "quantity_opened": quantity,
+            "quantity_closed": 0.0,
+            "gross_pnl_total": 0.0,
+            "commission_total": commission,
+            "net_pnl_total": 0.0,
+            "notes": "",
+            "created_at": now,
+            "updated_at": now,
+        }
+
     @staticmethod
     def _reconstruct_instrument(
-        session: Session,
         account_id: str,
         conid: Optional[int],
         symbol: str,
-        executions: List[Execution],
+        executions: List[tuple],
         tz,
-    ) -> Tuple[int, int]:
-        """Reconstruct trades for a single instrument."""
-        
-        open_lots = deque()
+    ) -> Tuple[List[dict], List[dict], List[dict]]:
+        """
+        Reconstruct trades for a single instrument.
+
+        Pure function of its arguments (no session), so instruments can run in
+        worker processes. `executions` are time-ordered
+        (id, ts_utc, side, quantity, price, commission) tuples.
+
+        Returns:
+            (trade_rows, trade_execution_rows, trade_day_rows) as dicts
+        """
+
+        position = PositionState.with_capacity(len(executions))
         current_trade = None
-        trades_created = 0
-        trade_days_created = 0
-        
-        daily_pnl = defaultdict(lambda: {"gross": 0.0, "commissions": 0.0, "shares_closed": 0.0})
-        
-        for exe in executions:
-            if not exe.ts_utc:
-                continue
-            try:
-                exe_utc = exe.ts_utc.replace(tzinfo=timezone.utc)
-                exe_local = exe_utc.astimezone(tz)
-                raw_day = exe_local.date()
-                
-                # If execution is on weekend, roll back to Friday
-                if raw_day.weekday() == 5:  # Saturday
-                    day_key = date(raw_day.year, raw_day.month, raw_day.day - 1)
-                elif raw_day.weekday() == 6:  # Sunday
-                    day_key = date(raw_day.year, raw_day.month, raw_day.day - 2)
-                else:
-                    day_key = raw_day
-            except Exception:
+        trade_sign = 0.0  # sign of current_trade's direction
+        # current_trade's running totals, written back to its row on close / at the end
+        acc_opened = acc_closed = acc_gross = acc_comm = 0.0
+        trades: List[dict] = []
+        trade_exec_rows: List[dict] = []
+        trade_day_rows: List[dict] = []
+
+        daily_pnl = {}  # current trade only: day -> [gross, commissions, shares_closed]
+        add_execution = TradeReconstructor._add_trade_execution
+
+        # Executions are time-ordered, so consecutive fills usually share a local
+        # day: remember that day's UTC window and only convert when we leave it.
+        # `day` is the open trade's bucket for that day, kept until either changes.
+        day_start = day_end = None
+        day_key = None
+        day = None
+
+        for exe_id, ts_utc, side, quantity, price, commission in executions:
+            if not ts_utc:
                 continue
+            if day_start is None or not (day_start <= ts_utc < day_end):
+                day = None
+                try:
+                    exe_utc = ts_utc.replace(tzinfo=timezone.utc)
+                    exe_local = exe_utc.astimezone(tz)
+                    raw_day = exe_local.date()
+                    day_start, day_end = TradeReconstructor._local_day_bounds(raw_day, tz)
+                    if not (day_start <= ts_utc < day_end):
+                        day_start = None  # odd zone transition at midnight; don't cache
+
+                    # If execution is on weekend, roll back to Friday
+                    day_key = raw_day + _WEEKEND_ROLLBACK[raw_day.weekday()]
+                except Exception:
+                    day_start = None
+                    day_key = None
             if day_key is None:
                 continue
-         
-            if exe.side == "BUY":
-                if not current_trade or current_trade.direction == "SHORT":
-                    if current_trade and current_trade.direction == "SHORT":
-                        close_qty = min(exe.quantity, sum(lot.qty for lot in open_lots))
-                        remaining = exe.quantity - close_qty
-                        
-                        to_close = close_qty
-                        while to_close > 0 and open_lots:
-                            lot = open_lots[0]
-                            matched = min(lot.qty, to_close)
-                            
-                            pnl = (lot.price - exe.price) * matched
-                            daily_pnl[(current_trade.id, day_key)]["gross"] += pnl
-                            daily_pnl[(current_trade.id, day_key)]["shares_closed"] += matched
-                            
-                            current_trade.quantity_closed += matched
-                            current_trade.gross_pnl_total += pnl
-                            
-                            to_close -= matched
-                            lot.qty -= matched
-                            if lot.qty == 0:
-                                open_lots.popleft()
-                        
-                        daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission
-                        current_trade.commission_total += exe.commission
-                        
-                        if close_qty > 0:
-                            TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, close_qty, "close")
-                        
-                        if len(open_lots) == 0:
-                            current_trade.closed_at_utc = exe.ts_utc
-                            current_trade.status = "closed"
-                            current_trade.net_pnl_total = current_trade.gross_pnl_total + current_trade.commission_total
-                            
-                            trade_days_created += TradeReconstructor._finalize_trade_days(
-                                session, current_trade, daily_pnl, tz
-                            )
-                            daily_pnl.clear()
-                            current_trade = None
-                        
-                        if remaining > 0:
-                            current_trade = Trade(
-                                account_id=account_id,
-                                symbol=symbol,
-                                conid=conid,
-                                direction="LONG",
-                                opened_at_utc=exe.ts_utc,
-                                status="open",
-                                quantity_opened=remaining,
-                                quantity_closed=0.0,
-                                gross_pnl_total=0.0,
-                                commission_total=exe.commission * (remaining / exe.quantity),
-                                net_pnl_total=0.0,
-                            )
-                            session.add(current_trade)
-                            session.flush()
-                            trades_created += 1
-                            
-                            open_lots.append(OpenLot(qty=remaining, price=exe.price, exe_id=exe.id))
-                            TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, remaining, "open")
-                            daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission * (remaining / exe.quantity)
-                    else:
-                        current_trade = Trade(
-                            account_id=account_id,
-                            symbol=symbol,
-                            conid=conid,
-                            direction="LONG",
-                            opened_at_utc=exe.ts_utc,
-                            status="open",
-                            quantity_opened=exe.quantity,
-                            quantity_closed=0.0,
-                            gross_pnl_total=0.0,
-                            commission_total=exe.commission,
-                            net_pnl_total=0.0,
-                        )
-                        session.add(current_trade)
-                        session.flush()
-                        trades_created += 1
-                        
-                        open_lots.append(OpenLot(qty=exe.quantity, price=exe.price, exe_id=exe.id))
-                        TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, exe.quantity, "open")
-                        daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission
-                else:
-                    current_trade.quantity_opened += exe.quantity
-                    current_trade.commission_total += exe.commission
-                    open_lots.append(OpenLot(qty=exe.quantity, price=exe.price, exe_id=exe.id))
-                    TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, exe.quantity, "open")
-                    daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission
-            
-            else:  # SELL
-                if not current_trade or current_trade.direction == "LONG":
-                    if current_trade and current_trade.direction == "LONG":
-                        close_qty = min(exe.quantity, sum(lot.qty for lot in open_lots))
-                        remaining = exe.quantity - close_qty
-                        
-                        to_close = close_qty
-                        while to_close > 0 and open_lots:
-                            lot = open_lots[0]
-                            matched = min(lot.qty, to_close)
-                            
-                            pnl = (exe.price - lot.price) * matched
-                            daily_pnl[(current_trade.id, day_key)]["gross"] += pnl
-                            daily_pnl[(current_trade.id, day_key)]["shares_closed"] += matched
-                            
-                            current_trade.quantity_closed += matched
-                            current_trade.gross_pnl_total += pnl
-                            
-                            to_close -= matched
-                            lot.qty -= matched
-                            if lot.qty == 0:
-                                open_lots.popleft()
-                        
-                        daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission
-                        current_trade.commission_total += exe.commission
-                        
-                        if close_qty > 0:
-                            TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, -close_qty, "close")
-                        
-                        if len(open_lots) == 0:
-                            current_trade.closed_at_utc = exe.ts_utc
-                            current_trade.status = "closed"
-                            current_trade.net_pnl_total = current_trade.gross_pnl_total + current_trade.commission_total
-                            
-                            trade_days_created += TradeReconstructor._finalize_trade_days(
-                                session, current_trade, daily_pnl, tz
-                            )
-                            daily_pnl.clear()
-                            current_trade = None
-                        
-                        if remaining > 0:
-                            current_trade = Trade(
-                                account_id=account_id,
-                                symbol=symbol,
-                                conid=conid,
-                                direction="SHORT",
-                                opened_at_utc=exe.ts_utc,
-                                status="open",
-                                quantity_opened=remaining,
-                                quantity_closed=0.0,
-                                gross_pnl_total=0.0,
-                                commission_total=exe.commission * (remaining / exe.quantity),
-                                net_pnl_total=0.0,
-                            )
-                            session.add(current_trade)
-                            session.flush()
-                            trades_created += 1
-                            
-                            open_lots.append(OpenLot(qty=remaining, price=exe.price, exe_id=exe.id))
-                            TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, -remaining, "open")
-                            daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission * (remaining / exe.quantity)
-                    else:
-                        current_trade = Trade(
-                            account_id=account_id,
-                            symbol=symbol,
-                            conid=conid,
-                            direction="SHORT",
-                            opened_at_utc=exe.ts_utc,
-                            status="open",
-                            quantity_opened=exe.quantity,
-                            quantity_closed=0.0,
-                            gross_pnl_total=0.0,
-                            commission_total=exe.commission,
-                            net_pnl_total=0.0,
-                        )
-                        session.add(current_trade)
-                        session.flush()
-                        trades_created += 1
-                        
-                        open_lots.append(OpenLot(qty=exe.quantity, price=exe.price, exe_id=exe.id))
-                        TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, -exe.quantity, "open")
-                        daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission
-                else:
-                    current_trade.quantity_opened += exe.quantity
-                    current_trade.commission_total += exe.commission
-                    open_lots.append(OpenLot(qty=exe.quantity, price=exe.price, exe_id=exe.id))
-                    TradeReconstructor._add_trade_execution(session, current_trade.id, exe.id, -exe.quantity, "open")
-                    daily_pnl[(current_trade.id, day_key)]["commissions"] += exe.commission
-        
-        if current_trade and daily_pnl:
-            trade_days_created += TradeReconstructor._finalize_trade_days(
-                session, current_trade, daily_pnl, tz
+
+            # BUY opens/extends LONG and closes SHORT; SELL is the mirror image.
+            # `sign` folds both into one state machine: signed qty and close P&L
+            # (cost - price * matched) both flip with it.
+            sign = 1.0 if side == "BUY" else -1.0
+
+            # Every fill books into the open trade's bucket for this day; it only
+            # needs looking up again after the day window moves.
+            if current_trade is not None:
+                trade_id = current_trade["id"]
+                if day is None:
+                    day = daily_pnl.get(day_key)
+                    if day is None:
+                        day = daily_pnl[day_key] = [0.0, 0.0, 0.0]
+
+            if current_trade is not None and trade_sign != sign:
+                # Close against open lots; any excess flips into a new trade
+
+                open_qty = position.open_qty
+                close_qty = open_qty if open_qty < quantity else quantity  # min() without the call
+                remaining = quantity - close_qty
+
+                matched, cost = position.consume(close_qty)
+                pnl = (cost - price * matched) * sign
+                day[0] += pnl
+                day[1] += commission
+                day[2] += matched
+
+                acc_closed += matched
+                acc_gross += pnl
+                acc_comm += commission
+
+                if close_qty > 0:
+                    add_execution(trade_exec_rows, trade_id, exe_id, sign * close_qty, "close")
+
+                if not position.has_lots:
+                    current_trade.update(
+                        quantity_opened=acc_opened,
+                        quantity_closed=acc_closed,
+                        gross_pnl_total=acc_gross,
+                        commission_total=acc_comm,
+                        net_pnl_total=acc_gross + acc_comm,
+                        closed_at_utc=ts_utc,
+                        status="closed",
+                    )
+
+                    TradeReconstructor._finalize_trade_days(trade_day_rows, current_trade, daily_pnl)
+                    daily_pnl = {}
+                    day = None
+                    current_trade = None
+
+                if remaining > 0:
+                    open_commission = commission * (remaining / quantity)
+                    current_trade = TradeReconstructor._new_trade(
+                        account_id, conid, symbol, _DIRECTIONS[sign], ts_utc, remaining, open_commission,
+                    )
+                    trade_sign = sign
+                    acc_opened, acc_closed, acc_gross, acc_comm = remaining, 0.0, 0.0, open_commission
+                    trades.append(current_trade)
+
+                    position.append_lot(remaining, price)
+                    add_execution(trade_exec_rows, current_trade["id"], exe_id, sign * remaining, "open")
+                    day = [0.0, open_commission, 0.0]
+                    daily_pnl = {day_key: day}
+
+            elif current_trade is not None:
+                # Scale into the open trade
+                acc_opened += quantity
+                acc_comm += commission
+                position.append_lot(quantity, price)
+                add_execution(trade_exec_rows, trade_id, exe_id, sign * quantity, "open")
+                day[1] += commission
+
+            else:
+                # Flat: open a new trade
+                current_trade = TradeReconstructor._new_trade(
+                    account_id, conid, symbol, _DIRECTIONS[sign], ts_utc, quantity, commission,
+                )
+                trade_sign = sign
+                acc_opened, acc_closed, acc_gross, acc_comm = quantity, 0.0, 0.0, commission
+                trades.append(current_trade)
+
+                position.append_lot(quantity, price)
+                add_execution(trade_exec_rows, current_trade["id"], exe_id, sign * quantity, "open")
+                day = [0.0, commission, 0.0]
+                daily_pnl = {day_key: day}
+
+        if current_trade is not None:
+            current_trade.update(
+                quantity_opened=acc_opened,
+                quantity_closed=acc_closed,
+                gross_pnl_total=acc_gross,
+                commission_total=acc_comm,
             )
-        
-        return trades_created, trade_days_created
-    
+            TradeReconstructor._finalize_trade_days(trade_day_rows, current_trade, daily_pnl)
+
+        return trades, trade_exec_rows, trade_day_rows
+
     @staticmethod
-    def _finalize_trade_days(session: Session, trade: Trade, daily_pnl: dict, tz) -> int:
-        """Create TradeDay records from accumulated daily P&L."""
-        count = 0
-        for (trade_id, day_date), pnl_data in daily_pnl.items():
-            if trade_id != trade.id:
-                continue
+    def _local_day_bounds(day: date, tz) -> Tuple[datetime, datetime]:
+        """[start, end) of a local calendar day in tz, as naive UTC datetimes."""
+        start = datetime.combine(day, time.min, tzinfo=tz).astimezone(timezone.utc)
+        end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz).astimezone(timezone.utc)
+        return start.replace(tzinfo=None), end.replace(tzinfo=None)
+
+    @staticmethod
+    def _finalize_trade_days(rows: list, trade: dict, daily_pnl: dict) -> None:
+        """Append TradeDay rows (as dicts) from the trade's {day: [gross, commissions, shares_closed]} buckets."""
+        for day_date, (gross, commissions, shares_closed) in daily_pnl.items():
             if day_date is None:
                 continue
-            if pnl_data.get("shares_closed", 0.0) <= 0:
+            if shares_closed <= 0:
                 continue
-        
-            trade_day = TradeDay(
-                trade_id=trade.id,
-                day_date_local=day_date,
-                day_status="closed" if trade.status == "closed" else "adjusted",
-                realized_gross=pnl_data.get("gross", 0.0),
-                commissions=pnl_data.get("commissions", 0.0),
-                realized_net=pnl_data.get("gross", 0.0) + pnl_data.get("commissions", 0.0),
-                shares_closed=pnl_data.get("shares_closed", 0.0),
+
+            rows.append(
+                {
+                    "trade_id": trade["id"],
+                    "day_date_local": day_date,
+                    "day_status": "closed" if trade["status"] == "closed" else "adjusted",
+                    "realized_gross": gross,
+                    "commissions": commissions,
+                    "realized_net": gross + commissions,
+                    "shares_closed": shares_closed,
+                }
             )
-            session.add(trade_day)
-            count += 1
-        
-        return count
@@ -1,16 +1,90 @@
 # src/io/ibkr_flex_parser.py
 """IBKR Flex Query XML parser."""
 
-import xml.etree.ElementTree as ET
-from datetime import datetime
-from typing import List, Optional, Tuple
-import pytz
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import BinaryIO, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
 from dataclasses import dataclass
 import re
+from xml.parsers import expat
 
 
+_ZERO = timedelta(0)
 
-@dataclass
+
+@lru_cache(maxsize=4096)
+def _plain_hour(tz: ZoneInfo, year: int, month: int, day: int, hour: int) -> bool:
+    """True if no DST transition touches this local hour (one offset, no fold)."""
+    first = datetime(year, month, day, hour, tzinfo=tz)
+    last = datetime(year, month, day, hour, 59, 59, 999999, tzinfo=tz)
+    offset = first.utcoffset()
+    return (
+        last.utcoffset() == offset
+        and first.replace(fold=1).utcoffset() == offset
+        and last.replace(fold=1).utcoffset() == offset
+    )
+
+
+def _localize(tz: ZoneInfo, dt_naive: datetime) -> datetime:
+    """Attach tz to a naive local wall-clock time."""
+    dt_local = dt_naive.replace(tzinfo=tz)
+    # Almost every hour is transition-free, so most timestamps are settled by
+    # one cached lookup per (zone, local hour).
+    if _plain_hour(tz, dt_naive.year, dt_naive.month, dt_naive.day, dt_naive.hour):
+        return dt_local
+
+    # Ambiguous (clock goes back) and non-existent (clock jumps forward) times
+    # are the ones whose offset depends on `fold`. Deterministic fallback: pick
+    # standard time for both.
+    alt = dt_local.replace(fold=1)
+    if alt.utcoffset() != dt_local.utcoffset() and alt.dst() == _ZERO and dt_local.dst() != _ZERO:
+        return alt
+    return dt_local
+
+
+# "<timestamp> <TZ>": the trailing zone name is optional
+_TS_TZ_RE = re.compile(r"^(.*?)(?:\s+([A-Za-z_\/]+))?$")
+_TS_FORMATS = ("%Y%m%d;%H%M%S", "%Y-%m-%d;%H:%M:%S")
+
+
+def _parse_fixed_width(base: str) -> Optional[datetime]:
+    """
+    Fast path for the two fixed-width Flex layouts, picked by length: once the
+    shape is checked, the C-level datetime.fromisoformat parses both, many
+    times faster than strptime. None if `base` has neither shape.
+    """
+    n = len(base)
+    if n == 15 and base[8] == ";":  # YYYYMMDD;HHMMSS
+        digits, hour = base[:8] + base[9:], base[9:11]
+    elif (
+        n == 19  # YYYY-MM-DD;HH:MM:SS
+        and base[4] == "-" and base[7] == "-" and base[10] == ";"
+        and base[13] == ":" and base[16] == ":"
+    ):
+        digits = base[0:4] + base[5:7] + base[8:10] + base[11:13] + base[14:16] + base[17:19]
+        hour = base[11:13]
+    else:
+        return None
+
+    # fromisoformat also reads 24:00 as next-day midnight; strptime rejects it
+    if not (digits.isascii() and digits.isdigit()) or hour >= "24":
+        return None
+    return datetime.fromisoformat(base)
+
+
+def _strptime_any(base: str) -> datetime:
+    """strptime against each supported layout; raises the last error if none match."""
+    last_err = None
+    for fmt in _TS_FORMATS:
+        try:
+            return datetime.strptime(base, fmt)
+        except ValueError as e:
+            last_err = e
+    raise last_err
+
+
+@dataclass(slots=True)
 class ParsedExecution:
     """Represents a single execution from IBKR Flex Query."""
     account_id: str
@@ -32,7 +106,7 @@ class ParsedExecution:
 class IBKRFlexParser:
     """Parse IBKR Flex Query XML exports."""
     
-    IBKR_TZ = pytz.timezone("US/Eastern")
+    IBKR_TZ = ZoneInfo("US/Eastern")
     
     @staticmethod
     def parse_timestamp(ts_str: str) -> Tuple[datetime, datetime]:
@@ -52,104 +126,147 @@ class IBKRFlexParser:
         if not ts_str:
             raise ValueError("Empty timestamp")
 
-        # Split optional trailing tz name: "<timestamp> <TZ>"
-        m = re.match(r"^(.*?)(?:\s+([A-Za-z_\/]+))?$", ts_str)
-        base = m.group(1).strip()
-        tz_name = (m.group(2) or "").strip()
+        # Split optional trailing tz name: "<timestamp> <TZ>". Flex rows rarely
+        # carry one, and a string without whitespace can't, so skip the regex.
+        if len(ts_str.split(maxsplit=1)) == 1:
+            base, tz = ts_str, IBKRFlexParser.IBKR_TZ
+        else:
+            m = _TS_TZ_RE.match(ts_str)
+            base = m.group(1).strip()
+            tz_name = (m.group(2) or "").strip()
+            tz = ZoneInfo(tz_name) if tz_name else IBKRFlexParser.IBKR_TZ  # ZoneInfo caches instances per key
 
-        tz = pytz.timezone(tz_name) if tz_name else IBKRFlexParser.IBKR_TZ
+        try:
+            # The fixed-width layouts (nearly every row) never reach strptime
+            dt_naive = _parse_fixed_width(base) or _strptime_any(base)
+            dt_local = _localize(tz, dt_naive)
+            return dt_local, dt_local.astimezone(timezone.utc)
+        except Exception as e:
+            raise ValueError(f"Unrecognized timestamp format: {ts_str}") from e
+    
+    @staticmethod
+    def parse_xml(xml_content: Union[str, bytes]) -> List[ParsedExecution]:
+        """
+        Parse IBKR Flex Query XML, streaming <Trade> elements.
 
-        fmts = ("%Y%m%d;%H%M%S", "%Y-%m-%d;%H:%M:%S")
-        last_err = None
+        Bytes that are not valid in the declared encoding (e.g. a stray Latin-1
+        byte in a UTF-8 export) are parsed again as UTF-8 with replacement
+        characters; anything still malformed raises expat.ExpatError.
+        """
+        parser, executions = IBKRFlexParser._trade_parser()
+        try:
+            parser.Parse(xml_content, True)
+        except expat.ExpatError:
+            if not isinstance(xml_content, bytes):
+                raise
+            return IBKRFlexParser._parse_replacing(xml_content)
+        return executions
 
-        for fmt in fmts:
-            try:
-                dt_naive = datetime.strptime(base, fmt)
+    @staticmethod
+    def parse_xml_stream(fileobj: BinaryIO) -> List[ParsedExecution]:
+        """
+        Parse IBKR Flex Query XML from a binary file object, read in chunks.
 
-                # Strict DST handling:
-                # - is_dst=None raises for ambiguous/non-existent times (preferred).
-                try:
-                    dt_local = tz.localize(dt_naive, is_dst=None)
-                except (pytz.AmbiguousTimeError, pytz.NonExistentTimeError):
-                    # Deterministic fallback:
-                    # - For ambiguous times (clock goes back), pick standard time (is_dst=False).
-                    # - For nonexistent times (clock jumps forward), also pick standard time.
-                    dt_local = tz.localize(dt_naive, is_dst=False)
+        Same invalid-byte fallback as parse_xml, which re-reads the file from
+        the start, so `fileobj` must be seekable.
+        """
+        parser, executions = IBKRFlexParser._trade_parser()
+        try:
+            parser.ParseFile(fileobj)
+        except expat.ExpatError:
+            fileobj.seek(0)
+            return IBKRFlexParser._parse_replacing(fileobj.read())
+        return executions
+
+    @staticmethod
+    def _parse_replacing(xml_bytes: bytes) -> List[ParsedExecution]:
+        """Parse `xml_bytes` decoded as UTF-8, invalid bytes replaced by U+FFFD."""
+        parser, executions = IBKRFlexParser._trade_parser()
+        parser.Parse(xml_bytes.decode("utf-8", errors="replace"), True)
+        return executions
 
-                return dt_local, dt_local.astimezone(pytz.UTC)
+    @staticmethod
+    def _trade_parser():
+        """An expat parser that appends each parsed <Trade> to the returned list."""
+        executions: List[ParsedExecution] = []
 
-            except Exception as e:
-                last_err = e
+        # Expat hands over each start tag's attributes as a dict; no element
+        # tree is ever built, so memory stays flat however large the export.
+        def on_start(name, attrs):
+            if name == "Trade":
+                execution = IBKRFlexParser._parse_trade(attrs)
+                if execution is not None:
+                    executions.append(execution)
+
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = on_start
+        return parser, executions
 
-        raise ValueError(f"Unrecognized timestamp format: {ts_str}") from last_err
-    
     @staticmethod
-    def parse_xml(xml_content: str) -> List[ParsedExecution]:
-        """Parse IBKR Flex Query XML."""
-        root = ET.fromstring(xml_content)
-        executions = []
-        
-        for trade_elem in root.findall(".//Trade"):
-            try:
-                account_id = trade_elem.get("accountId", "").strip()
-                ib_execution_id = trade_elem.get("ibExecID", "").strip()
-                symbol = trade_elem.get("symbol", "").strip()
-                conid_str = trade_elem.get("conid", "")
-                conid = int(conid_str) if conid_str else None
-
-                if not account_id or not ib_execution_id or not symbol:
-                    continue
-                
-                # Timestamp from dateTime field
-                ts_raw = trade_elem.get("dateTime", "").strip()
-                if not ts_raw:
-                    continue
-                
-                _, dt_utc = IBKRFlexParser.parse_timestamp(ts_raw)
-
-                
-                side = trade_elem.get("buySell", "").strip().upper()
-                if side not in ("BUY", "SELL"):
-                    continue
-                
-                quantity = abs(float(trade_elem.get("quantity", 0)))
-                price = float(trade_elem.get("tradePrice", 0))
-                commission = float(trade_elem.get("ibCommission", 0))
-                
-                exchange = trade_elem.get("exchange", "").strip() or None
-                order_type = trade_elem.get("orderType", "").strip() or None
-                
-                # Parse order time if present
-                order_time_str = trade_elem.get("orderTime", "").strip()
-                order_time_utc = None
-                if order_time_str:
-                    try:
-                        _, order_time_utc = IBKRFlexParser.parse_timestamp(order_time_str)
-                    except ValueError:
-                        pass
-                
-                currency = "USD"  # Your XML doesn't have per-trade currency
-                
-                execution = ParsedExecution(
-                    account_id=account_id,
-                    ib_execution_id=ib_execution_id,
-                    symbol=symbol,
-                    conid=conid,
-                    ts_raw=ts_raw,
-                    ts_utc=dt_utc,
-                    side=side,
-                    quantity=quantity,
-                    price=price,
-                    commission=commission,
-                    exchange=exchange,
-                    order_type=order_type,
-                    order_time_utc=order_time_utc,
-                    currency=currency,
-                )
-                
-                executions.append(execution)
+    def _parse_trade(attr: dict) -> Optional[ParsedExecution]:
+        """One <Trade> element's attributes as a ParsedExecution, or None to skip it."""
+        # One bound lookup for every attribute; strip only the free-text
+        # fields (float()/int() already ignore surrounding whitespace).
+        get = attr.get
+        try:
+            account_id = get("accountId", "").strip()
+            ib_execution_id = get("ibExecID", "").strip()
+            symbol = get("symbol", "").strip()
+            if not account_id or not ib_execution_id or not symbol:
+                return None
+
+            conid_str = get("conid")
+            conid = int(conid_str) if conid_str else None
+
+            # Timestamp from dateTime field
+            ts_raw = get("dateTime", "").strip()
+            if not ts_raw:
+                return None
+
+            side = get("buySell", "").strip().upper()
+            if side not in ("BUY", "SELL"):
+                return None
+
+            _, dt_utc = IBKRFlexParser.parse_timestamp(ts_raw)
+
+            quantity = abs(float(get("quantity", 0)))
+            price = float(get("tradePrice", 0))
+            commission = float(get("ibCommission", 0))
+
+            exchange = get("exchange")
+            exchange = (exchange.strip() or None) if exchange else None
+            order_type = get("orderType")
+            order_type = (order_type.strip() or None) if order_type else None
+
+            # Parse order time if present
+            order_time_str = get("orderTime")
+            order_time_utc = None
+            if order_time_str:
+                try:
+                    _, order_time_utc = IBKRFlexParser.parse_timestamp(order_time_str)
+                except ValueError:
+                    pass
+
+            currency = "USD"  # Your XML doesn't have per-trade currency
             
-            except (ValueError, AttributeError) as e:
-                continue
+            execution = ParsedExecution(
+                account_id=account_id,
+                ib_execution_id=ib_execution_id,
+                symbol=symbol,
+                conid=conid,
+                ts_raw=ts_raw,
+                ts_utc=dt_utc,
+                side=side,
+                quantity=quantity,
+                price=price,
+                commission=commission,
+                exchange=exchange,
+                order_type=order_type,
+                order_time_utc=order_time_utc,
+                currency=currency,
+            )
+            
+            return execution
         
-        return executions
+        except (ValueError, AttributeError) as e:
+            return None
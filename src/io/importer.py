@@ -2,7 +2,8 @@
 """Idempotent import logic for IBKR executions."""
 
 from typing import List, Tuple
-from sqlmodel import Session, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session
 
 from src.db.models import Execution, Account
 from src.io.ibkr_flex_parser import ParsedExecution
@@ -21,21 +22,12 @@ class IBKRImporter:
         Import parsed executions into database.
 
         Idempotent rules:
-        - Skip if execution already exists in DB for this account (account_id, ib_execution_id).
+        - Skip if execution already exists in DB for this account (account_id, ib_execution_id);
+          enforced by the unique constraint via INSERT ... ON CONFLICT DO NOTHING.
         - Skip duplicates within the same uploaded file.
         """
         warnings: List[str] = []
-        newly_inserted = 0
-
-        # Existing exec IDs already in DB for this account
-        stmt = select(Execution.ib_execution_id).where(Execution.account_id == account.id)
-        rows = session.exec(stmt).all()
-
-        # rows may come back as ["abc", "def"] OR [("abc",), ("def",)] depending on stack;
-        # normalize safely.
-        existing_ids = set()
-        for r in rows:
-            existing_ids.add(r[0] if isinstance(r, tuple) else r)
+        new_rows: List[dict] = []
 
         # Also track duplicates inside this upload
         seen_in_file = set()
@@ -52,35 +44,40 @@ class IBKRImporter:
                 continue
             seen_in_file.add(exec_id)
 
-            # Duplicate already in DB
-            if exec_id in existing_ids:
-                warnings.append(f"Skipped duplicate in DB: {parsed.symbol} {exec_id}")
-                continue
-
-            execution = Execution(
-                account_id=account.id,
-                ib_execution_id=exec_id,
-                symbol=parsed.symbol,
-                conid=parsed.conid,
-                ts_utc=parsed.ts_utc,
-                ts_raw=parsed.ts_raw,
-                side=parsed.side,
-                quantity=parsed.quantity,
-                price=parsed.price,
-                commission=parsed.commission,
-                exchange=parsed.exchange,
-                order_type=parsed.order_type,
-                order_time_utc=parsed.order_time_utc,
-                currency=parsed.currency,
+            new_rows.append(
+                {
+                    "account_id": account.id,
+                    "ib_execution_id": exec_id,
+                    "symbol": parsed.symbol,
+                    "conid": parsed.conid,
+                    "ts_utc": parsed.ts_utc,
+                    "ts_raw": parsed.ts_raw,
+                    "side": parsed.side,
+                    "quantity": parsed.quantity,
+                    "price": parsed.price,
+                    "commission": parsed.commission,
+                    "exchange": parsed.exchange,
+                    "order_type": parsed.order_type,
+                    "order_time_utc": parsed.order_time_utc,
+                    "currency": parsed.currency,
+                }
             )
 
-            session.add(execution)
-            newly_inserted += 1
+        if not new_rows:
+            return len(parsed_executions), 0, warnings
 
-            # Important: update existing_ids so later rows in the same run can’t add it again
-            existing_ids.add(exec_id)
+        # One executemany INSERT; rows already in the DB are skipped by the
+        # uq_account_ib_exec constraint.
+        stmt = (
+            insert(Execution)
+            .on_conflict_do_nothing(index_elements=["account_id", "ib_execution_id"])
+            .returning(Execution.ib_execution_id)
+        )
+        inserted_ids = set(session.exec(stmt, params=new_rows).scalars())
+        session.commit()
 
-        if newly_inserted:
-            session.commit()
+        for row in new_rows:
+            if row["ib_execution_id"] not in inserted_ids:
+                warnings.append(f"Skipped duplicate in DB: {row['symbol']} {row['ib_execution_id']}")
 
-        return len(parsed_executions), newly_inserted, warnings
+        return len(parsed_executions), len(inserted_ids), warnings
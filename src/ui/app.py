@@ -1,8 +1,19 @@
 # src/ui/app.py
 """Main Streamlit application"""
 
+import importlib
+
 import streamlit as st
 
+# Nav label -> module under src.ui.pages
+_PAGES = {
+    "Import": "import_page",
+    "Trades List": "trades_list_page",
+    "Reports": "reports_page",
+    "Calendar": "calendar_page",
+    "Journal": "journal_page",
+}
+
 
 def init_session_state():
     if "account_id" not in st.session_state:
@@ -12,9 +23,6 @@ def init_session_state():
 
 
 def main_app():
-    # Import pages lazily to avoid import-time side effects / circular imports
-    from src.ui.pages import import_page, journal_page, calendar_page, trades_list_page, reports_page
-
     st.title("Trading Journal")
 
     with st.sidebar:
@@ -30,21 +38,12 @@ def main_app():
         st.divider()
         st.caption("Session-only: data lives in memory for this tab and is reset when you upload another XML or refresh.")
 
-    page = st.selectbox("Navigate", ["Import", "Trades List", "Reports", "Calendar", "Journal"])
-
-    if page == "Import":
-        import_page.render()
-        return
+    page = st.selectbox("Navigate", list(_PAGES))
 
-    if not st.session_state.account_id:
+    if page != "Import" and not st.session_state.account_id:
         st.warning("Import an XML first.")
         return
 
-    if page == "Trades List":
-        trades_list_page.render()
-    elif page == "Reports":
-        reports_page.render()
-    elif page == "Calendar":
-        calendar_page.render()
-    elif page == "Journal":
-        journal_page.render()
+    # Import only the selected page's module, on first visit; pages not yet
+    # opened (and their dependencies) are never loaded.
+    importlib.import_module(f"src.ui.pages.{_PAGES[page]}").render()
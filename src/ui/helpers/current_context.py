@@ -2,6 +2,11 @@
 """Function(s) to Expose current runtime context"""
 
 import streamlit as st
+from sqlalchemy import func
+from sqlmodel import select
+
+from src.db.models import Trade
+from src.db.session import get_session
 
 def require_account_id() -> str:
     account_id = st.session_state.get("account_id")
@@ -10,3 +15,15 @@ def require_account_id() -> str:
         st.stop()
     return account_id
 
+def data_version(account_id: str):
+    """
+    Cache key for anything derived from the account's trades.
+
+    Trades are rebuilt wholesale on import, so the newest updated_at changes
+    exactly when the data does. Cached loaders take it as a `stamp` argument
+    they never read: it is only there so an import invalidates their entries.
+    """
+    with get_session() as session:
+        return session.exec(
+            select(func.max(Trade.updated_at)).where(Trade.account_id == account_id)
+        ).one()
@@ -3,19 +3,71 @@
 
 
 import calendar
+import functools
 from datetime import date
 
 
-import pandas as pd
 import streamlit as st
+from sqlalchemy import func
 from sqlmodel import select
 
 
 from src.db.models import Trade, TradeDay
 from src.db.session import get_session
-from src.ui.helpers.current_context import require_account_id
+from src.ui.helpers.current_context import data_version, require_account_id
 
 
+# Month grids never change; memoize them across reruns (callers must not mutate).
+_monthcal = functools.lru_cache(maxsize=256)(calendar.monthcalendar)
+_monthrange = functools.lru_cache(maxsize=256)(calendar.monthrange)
+
+_DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_HEADER_ROW = (
+    "<tr>"
+    + "".join(f'<th style="text-align: left; border: none;">{name}</th>' for name in _DAY_NAMES)
+    + "</tr>"
+)
+
+# Cell backgrounds indexed by the sign of the day's P&L (0, +1, -1); rgba keeps
+# the text readable instead of dimming the whole cell with opacity.
+_CELL_BG = ("rgba(128, 128, 128, 0.25)", "rgba(0, 128, 0, 0.25)", "rgba(255, 0, 0, 0.25)")
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _daily_pnl(account_id: str, stamp) -> dict:
+    """
+    {day: (gross, net)} for every trading day of the account, in one grouped query.
+
+    Feeds both the month selector and the grid, so month/mode switches never go
+    back to the DB.
+    """
+    with get_session() as session:
+        stmt = (
+            select(
+                TradeDay.day_date_local,
+                func.sum(TradeDay.realized_gross),
+                func.sum(TradeDay.realized_net),
+            )
+            .join(Trade, Trade.id == TradeDay.trade_id)
+            .where(Trade.account_id == account_id)
+            .group_by(TradeDay.day_date_local)
+        )
+        return {d: (float(g), float(n)) for d, g, n in session.exec(stmt).all()}
+
+
+def _month_options(daily_pnl: dict) -> list:
+    """First-of-month dates for months that have TradeDays."""
+    # A few hundred days at most: a set of month starts beats any array round-trip
+    return sorted({d.replace(day=1) for d in daily_pnl})
+
+
+def _month_pnl(daily_pnl: dict, year: int, month: int, use_gross: bool) -> dict:
+    """Per-day P&L for one month."""
+    month_start = date(year, month, 1)
+    month_end = date(year, month, _monthrange(year, month)[1])
+    col = 0 if use_gross else 1
+    return {d: v[col] for d, v in daily_pnl.items() if month_start <= d <= month_end}
+
 
 def render():
     st.subheader("Calendar P&L")
@@ -24,51 +76,23 @@ def render():
 
     use_gross = st.checkbox("Show Gross (vs Net)", value=False)
 
-    # Find available months based on TradeDay dates for this account
-    with get_session() as session:
-        stmt_dates = (
-            select(TradeDay.day_date_local)
-            .join(Trade, Trade.id == TradeDay.trade_id)
-            .where(Trade.account_id == account_id)
-        )
-        all_days = session.exec(stmt_dates).all()
+    daily_pnl = _daily_pnl(account_id, data_version(account_id))
+    months = _month_options(daily_pnl)
 
-    if not all_days:
+    if not months:
         st.info("No trades yet. Import IBKR data first.")
         return
 
-    # Build month options from available days
-    day_series = pd.to_datetime(pd.Series(all_days))
-    months = sorted(day_series.dt.to_period("M").unique())
-
     selected_month = st.selectbox(
         "Select Month",
         months,
-        format_func=lambda p: p.strftime("%Y-%m"),
+        format_func=lambda d: d.strftime("%Y-%m"),
         index=len(months) - 1,  # default to most recent month
     )
 
-    year = int(selected_month.year)
-    month = int(selected_month.month)
-    month_start = date(year, month, 1)
-    month_end = date(year, month, calendar.monthrange(year, month)[1])
-
-    # Pull TradeDays for the selected month (account-scoped)
-    with get_session() as session:
-        stmt = (
-            select(TradeDay)
-            .join(Trade, Trade.id == TradeDay.trade_id)
-            .where(Trade.account_id == account_id)
-            .where(TradeDay.day_date_local >= month_start)
-            .where(TradeDay.day_date_local <= month_end)
-        )
-        trade_days = session.exec(stmt).all()
-
-    # Aggregate pnl by date
-    by_day_pnl = {}
-    for td in trade_days:
-        pnl = td.realized_gross if use_gross else td.realized_net
-        by_day_pnl[td.day_date_local] = by_day_pnl.get(td.day_date_local, 0.0) + float(pnl)
+    year = selected_month.year
+    month = selected_month.month
+    by_day_pnl = _month_pnl(daily_pnl, year, month, use_gross)
 
     # Month summary
     month_total = sum(by_day_pnl.values())
@@ -84,41 +108,40 @@ def render():
 
     st.divider()
 
-    # Calendar grid
-    cal = calendar.monthcalendar(year, month)
+    # Calendar grid: the whole month as one HTML table (a single element)
+    cal = _monthcal(year, month)
+
+    html = ['<table style="width: 100%; table-layout: fixed; border-collapse: separate; border-spacing: 6px;">']
 
     # Day headers
-    cols = st.columns(7)
-    for i, day_name in enumerate(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]):
-        cols[i].write(f"**{day_name}**")
+    html.append(_HEADER_ROW)
 
     # Cells
     for week in cal:
-        cols = st.columns(7)
-        for i, day_num in enumerate(week):
+        html.append("<tr>")
+        for day_num in week:
             if day_num == 0:
-                cols[i].write("")
+                html.append('<td style="border: none;"></td>')
                 continue
 
             d = date(year, month, day_num)
             pnl = by_day_pnl.get(d)
 
             if pnl is None:
-                cols[i].write(str(day_num))
+                html.append(f'<td style="border: none; vertical-align: top; padding: 10px;">{day_num}</td>')
                 continue
 
-            # Use rgba for transparency instead of opacity
-            bg_color = "rgba(0, 128, 0, 0.25)" if pnl > 0 else "rgba(255, 0, 0, 0.25)" if pnl < 0 else "rgba(128, 128, 128, 0.25)"
-            
-            with cols[i]:
-                st.markdown(
-                    f"""
-                    <div style="background-color: {bg_color}; padding: 10px; border-radius: 6px;">
-                      <div style="color: #262730; font-weight: 500; text-align: left;">{day_num}</div>
-                      <div style="color: #262730; font-weight: 700; font-size: 16px; text-align: center; margin-top: 4px;">${pnl:.2f}</div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
+            bg_color = _CELL_BG[(pnl > 0) - (pnl < 0)]
+
+            html.append(
+                f'<td style="border: none; vertical-align: top; background-color: {bg_color}; padding: 10px; border-radius: 6px;">'
+                f'<div style="color: #262730; font-weight: 500; text-align: left;">{day_num}</div>'
+                f'<div style="color: #262730; font-weight: 700; font-size: 16px; text-align: center; margin-top: 4px;">${pnl:.2f}</div>'
+                "</td>"
+            )
+        html.append("</tr>")
+
+    html.append("</table>")
+    st.markdown("".join(html), unsafe_allow_html=True)
 
     st.caption(f"Mode: {'Gross' if use_gross else 'Net'} • Session-only data")
@@ -3,8 +3,10 @@
 
 import hashlib
 from uuid import uuid4
+from xml.parsers.expat import ExpatError
 
 import streamlit as st
+from sqlalchemy import case, func
 from sqlmodel import select
 
 from src.db.session import get_session, reset_db
@@ -34,6 +36,17 @@ def _reset_flow():
     st.rerun()
 
 
+@st.cache_data(show_spinner=False, max_entries=2)
+def _parse_upload(file_hash: str, _uploaded_file) -> list:
+    """
+    Parsed executions for an upload. Keyed on the file's SHA-256 only (the
+    underscore keeps Streamlit from hashing the file), so reruns skip parsing.
+    """
+    # Raw bytes, so expat honours the file's declared encoding
+    _uploaded_file.seek(0)
+    return IBKRFlexParser.parse_xml_stream(_uploaded_file)
+
+
 def render():
     _ensure_state()
 
@@ -50,9 +63,8 @@ def render():
         st.info("Upload an XML to begin.")
         return
 
-    # Read bytes ONCE
-    b = uploaded_file.getvalue()
-    current_hash = hashlib.sha256(b).hexdigest()
+    # Hash the upload in place (no copy of the bytes), then stream it into the parser
+    current_hash = hashlib.file_digest(uploaded_file, "sha256").hexdigest()
 
     # New upload => new DB + clear analysis state
     if st.session_state.file_hash != current_hash:
@@ -62,9 +74,11 @@ def render():
         reset_db()
         st.rerun()
 
-    xml_content = b.decode("utf-8", errors="replace")
-
-    parsed_executions = IBKRFlexParser.parse_xml(xml_content)
+    try:
+        parsed_executions = _parse_upload(current_hash, uploaded_file)
+    except ExpatError as e:
+        st.error(f"Could not parse XML: {e}")
+        return
     if not parsed_executions:
         st.error("No executions found in XML")
         return
@@ -85,6 +99,9 @@ def render():
 
     if do_import and not already_imported:
         with get_session() as session:
+            # Keep `account` loaded across the importer/reconstructor commits
+            session.expire_on_commit = False
+
             # Create account if needed
             account = None
             if st.session_state.account_id:
@@ -98,7 +115,6 @@ def render():
                 )
                 session.add(account)
                 session.commit()
-                session.refresh(account)
                 st.session_state.account_id = account.id
 
             total, new, warnings = IBKRImporter.import_executions(
@@ -126,22 +142,21 @@ def render():
 
     # Stats (only if imported / account exists)
     if st.session_state.account_id:
+        account_id = st.session_state.account_id
         with get_session() as session:
-            account = session.get(Account, st.session_state.account_id)
-            if not account:
-                return
-
+            # Counts for the imported account
             exec_count = session.exec(
-                select(Execution).where(Execution.account_id == account.id)
-            ).all()
-            trade_count = session.exec(
-                select(Trade).where(Trade.account_id == account.id)
-            ).all()
+                select(func.count()).select_from(Execution).where(Execution.account_id == account_id)
+            ).one()
+            trade_count, open_count = session.exec(
+                select(func.count(), func.sum(case((Trade.status == "open", 1), else_=0)))
+                .where(Trade.account_id == account_id)
+            ).one()
 
         st.divider()
         st.subheader("Account Statistics")
 
         col1, col2, col3 = st.columns(3)
-        col1.metric("Total Executions", len(exec_count))
-        col2.metric("Reconstructed Trades", len(trade_count))
-        col3.metric("Open Trades", sum(1 for t in trade_count if t.status == "open"))
+        col1.metric("Total Executions", exec_count)
+        col2.metric("Reconstructed Trades", trade_count)
+        col3.metric("Open Trades", open_count or 0)
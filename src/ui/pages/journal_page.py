@@ -1,6 +1,7 @@
 # src/ui/pages/journal_page.py
 """Journal page - daily P&L view."""
 
+import pandas as pd
 import streamlit as st
 from sqlmodel import select
 from zoneinfo import ZoneInfo
@@ -11,6 +12,13 @@ from src.ui.helpers.current_context import require_account_id
 from src.db.models import Trade, TradeDay
 from src.domain.metrics import MetricsCalculator
 
+# Trades loaded per "Load more" step on a busy day
+_PAGE_SIZE = 25
+
+
+def _load_more():
+    st.session_state.journal_limit += _PAGE_SIZE
+
 
 def render():
     """Render journal page."""
@@ -20,23 +28,28 @@ def render():
     tz = st.session_state.report_timezone
 
     with get_session() as session:
-        # Get all trade_days for this account (via Trade join)
+        # Distinct trading days for this account (via Trade join), newest first
         stmt = (
-            select(TradeDay)
+            select(TradeDay.day_date_local)
             .join(Trade)
             .where(Trade.account_id == account_id)
+            .distinct()
             .order_by(TradeDay.day_date_local.desc())
         )
-        trade_days = session.exec(stmt).all()
+        unique_dates = session.exec(stmt).all()
 
-        if not trade_days:
+        if not unique_dates:
             st.info("No trades yet. Import IBKR data first.")
             return
 
-        unique_dates = sorted({td.day_date_local for td in trade_days}, reverse=True)
-
         selected_date = st.selectbox("Select Date", unique_dates)
 
+        # A different day starts again from the first page
+        if st.session_state.get("journal_date") != selected_date:
+            st.session_state.journal_date = selected_date
+            st.session_state.journal_limit = _PAGE_SIZE
+        limit = st.session_state.journal_limit
+
         summary = MetricsCalculator.get_daily_summary(
             session=session,
             account_id=account_id,
@@ -51,36 +64,74 @@ def render():
 
         st.divider()
 
-        # Trades for this day (must still be restricted to this account)
+        # Trades for this day (must still be restricted to this account); only
+        # the columns shown below
         stmt = (
-            select(TradeDay, Trade)
+            select(
+                Trade.symbol,
+                Trade.direction,
+                Trade.opened_at_utc,
+                Trade.status,
+                Trade.notes,
+                TradeDay.realized_gross,
+                TradeDay.commissions,
+                TradeDay.realized_net,
+                TradeDay.shares_closed,
+            )
             .join(Trade, Trade.id == TradeDay.trade_id)
             .where(Trade.account_id == account_id)
             .where(TradeDay.day_date_local == selected_date)
-            .order_by(Trade.opened_at_utc.asc())
+            .order_by(Trade.opened_at_utc.asc(), Trade.id)
+            .limit(limit)
         )
         rows = session.exec(stmt).all()
 
     st.subheader("Trades on this day")
 
-    for trade_day, trade in rows:
-        title = f"{trade.symbol} - {trade.direction} (Net: ${trade_day.realized_net:.2f})"
-        with st.expander(title):
-            c1, c2, c3 = st.columns(3)
-            c1.write(f"**Direction:** {trade.direction}")
-            # Convert UTC to local timezone
-            tz_obj = ZoneInfo(tz)
-            opened_utc = trade.opened_at_utc.replace(tzinfo=dt_timezone.utc)
-            opened_local = opened_utc.astimezone(tz_obj)
-            c2.write(f"**Opened:** {opened_local.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-            c3.write(f"**Status:** {trade.status}")
-
-            st.write(f"**Gross P&L:** ${trade_day.realized_gross:.2f}")
-            st.write(f"**Commissions:** ${trade_day.commissions:.2f}")
-            st.write(f"**Net P&L:** ${trade_day.realized_net:.2f}")
-            st.write(f"**Shares Closed:** {trade_day.shares_closed}")
-
-            if trade.notes:
-                st.write(f"**Notes:** {trade.notes}")
+    # One row per trade; the grid formats the numbers and a selected row
+    # opens its details below.
+    tz_obj = ZoneInfo(tz)
+    opened = [
+        row.opened_at_utc.replace(tzinfo=dt_timezone.utc).astimezone(tz_obj) for row in rows
+    ]
+    df = pd.DataFrame(
+        {
+            "Symbol": [row.symbol for row in rows],
+            "Direction": [row.direction for row in rows],
+            "Opened": [o.strftime("%Y-%m-%d %H:%M:%S") for o in opened],
+            "Status": [row.status for row in rows],
+            "Gross P&L": [row.realized_gross for row in rows],
+            "Commissions": [row.commissions for row in rows],
+            "Net P&L": [row.realized_net for row in rows],
+            "Shares Closed": [row.shares_closed for row in rows],
+        }
+    )
+    money = st.column_config.NumberColumn(format="$%.2f")
+    event = st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Gross P&L": money, "Commissions": money, "Net P&L": money},
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"journal_trades_{selected_date}",
+    )
+
+    if event.selection.rows:
+        i = event.selection.rows[0]
+        row = rows[i]
+        # One markdown block (one frontend element) for the whole panel
+        st.markdown(
+            f"#### {row.symbol} - {row.direction} (Net: ${row.realized_net:.2f})\n\n"
+            f"**Opened:** {opened[i].strftime('%Y-%m-%d %H:%M:%S %Z')}  \n"
+            f"**Status:** {row.status}  \n"
+            + (f"**Notes:** {row.notes}" if row.notes else "No notes for this trade.")
+        )
+
+    # One TradeDay per trade and day, so the summary's count is the row total
+    total = summary["trades_count"]
+    if total > limit:
+        st.caption(f"Showing {limit} of {total} trades")
+        st.button("Load more", on_click=_load_more)
 
     st.caption(f"Report timezone: {tz}")
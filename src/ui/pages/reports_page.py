@@ -2,91 +2,153 @@
 """Reports page - overview, instrument stats, and equity curve."""
 
 import streamlit as st
-import plotly.express as px
-import pandas as pd
 
 from src.db.session import get_session
-from src.ui.helpers.current_context import require_account_id
+from src.ui.helpers.current_context import data_version, require_account_id
 from src.domain.metrics import MetricsCalculator
 
 
+# Report data keyed on (account, data version, options): widget reruns and
+# report switches are served from memory until the next import.
+@st.cache_data(show_spinner=False, max_entries=16)
+def _overview_stats(account_id: str, stamp) -> dict:
+    # One aggregate already returns gross, net and commission totals side by side
+    with get_session() as session:
+        return MetricsCalculator.get_overview_stats(session, account_id)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _instrument_stats(account_id: str, stamp):
+    with get_session() as session:
+        return MetricsCalculator.get_instrument_stats(session, account_id)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _equity_curve(account_id: str, stamp, report_timezone: str, use_gross: bool):
+    with get_session() as session:
+        return MetricsCalculator.get_equity_curve(
+            session=session,
+            account_id=account_id,
+            report_timezone=report_timezone,
+            use_gross=use_gross,
+        )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _entry_time_of_day_stats(account_id: str, stamp, report_timezone: str, use_gross: bool):
+    with get_session() as session:
+        return MetricsCalculator.get_entry_time_of_day_stats(
+            session=session,
+            account_id=account_id,
+            report_timezone=report_timezone,
+            use_gross=use_gross,
+        )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _price_bucket_stats(account_id: str, stamp, use_gross: bool):
+    with get_session() as session:
+        return MetricsCalculator.get_price_bucket_stats(
+            session=session,
+            account_id=account_id,
+            use_gross=use_gross,
+        )
+
+
+def _bar(x, y, title: str, x_label: str, y_label: str, colored: bool = False):
+    """
+    Bar chart of `y` against `x`, built with plotly.graph_objects.
+
+    `colored` shades each bar red -> green by its value and shows the scale.
+    """
+    import plotly.graph_objects as go
+
+    marker = None
+    if colored:
+        marker = dict(
+            color=y,
+            colorscale=[[0, "red"], [1, "green"]],
+            showscale=True,
+            colorbar=dict(title=dict(text=y_label)),
+        )
+    return go.Figure(
+        go.Bar(
+            x=x,
+            y=y,
+            marker=marker,
+            hovertemplate=f"{x_label}=%{{x}}<br>{y_label}=%{{y}}<extra></extra>",
+        ),
+        layout=dict(title=dict(text=title), xaxis_title=x_label, yaxis_title=y_label),
+    )
+
+
 def render():
     """Render reports page."""
     st.subheader("Reports")
 
     account_id = require_account_id()
 
-    report_type = st.selectbox(
-        "Select Report",
-        ["Overview", "Instrument Performance", "Equity Curve", "Time of Day (Entry)", "Price Levels"],
-    )
+    report_type = st.selectbox("Select Report", list(_REPORTS))
 
-    with get_session() as session:
-        if report_type == "Overview":
-            render_overview(session, account_id)
-        elif report_type == "Instrument Performance":
-            render_instrument_stats(session, account_id)
-        elif report_type == "Equity Curve":
-            render_equity_curve(session, account_id)
-        elif report_type == "Time of Day (Entry)":
-            render_time_of_day_entry(session, account_id)
-        elif report_type == "Price Levels":
-            render_price_levels(session, account_id)
-
-
-def render_overview(session, account_id: str):
+    _REPORTS[report_type](account_id, data_version(account_id))
+
+
+def render_overview(account_id: str, stamp):
     st.subheader("Trading Overview")
 
-    stats_net = MetricsCalculator.get_overview_stats(session, account_id, use_gross=False)
-    stats_gross = MetricsCalculator.get_overview_stats(session, account_id, use_gross=True)
+    stats = _overview_stats(account_id, stamp)
 
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Closed Trades", stats_net["total_trades"])
-    col2.metric("Win Rate", f"{stats_net['win_rate']:.1%}")
-    col3.metric("Profit Factor", f"{stats_net['profit_factor']:.2f}")
-    col4.metric("Total Net P&L", f"${stats_net['total_net']:.2f}")
+    col1.metric("Total Closed Trades", stats["total_trades"])
+    col2.metric("Win Rate", f"{stats['win_rate']:.1%}")
+    col3.metric("Profit Factor", f"{stats['profit_factor']:.2f}")
+    col4.metric("Total Net P&L", f"${stats['total_net']:.2f}")
 
     st.divider()
 
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Total Gross", f"${stats_gross['total_gross']:.2f}")
-        st.metric("Total Commissions", f"${stats_net['total_commissions']:.2f}")
+        st.metric("Total Gross", f"${stats['total_gross']:.2f}")
+        st.metric("Total Commissions", f"${stats['total_commissions']:.2f}")
     with col2:
-        st.metric("Avg Win", f"${stats_net['avg_win']:.2f}")
-        st.metric("Avg Loss", f"${stats_net['avg_loss']:.2f}")
+        st.metric("Avg Win", f"${stats['avg_win']:.2f}")
+        st.metric("Avg Loss", f"${stats['avg_loss']:.2f}")
 
 
-def render_instrument_stats(session, account_id: str):
+def render_instrument_stats(account_id: str, stamp):
     st.subheader("Performance by Instrument")
 
-    df = MetricsCalculator.get_instrument_stats(session, account_id)
+    df = _instrument_stats(account_id, stamp)
 
     if df is None or df.empty:
         st.info("No closed trades yet.")
         return
 
-    df = df.copy()
-    df["win_rate"] = df["win_rate"].apply(lambda x: f"{x:.1%}")
-    df["gross_pnl"] = df["gross_pnl"].apply(lambda x: f"${x:.2f}")
-    df["commissions"] = df["commissions"].apply(lambda x: f"${x:.2f}")
-    df["net_pnl"] = df["net_pnl"].apply(lambda x: f"${x:.2f}")
-
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    # Numeric columns, formatted by the grid (so they sort by value)
+    money = st.column_config.NumberColumn(format="$%.2f")
+    st.dataframe(
+        df.assign(win_rate=df["win_rate"] * 100),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "win_rate": st.column_config.NumberColumn(format="%.1f%%"),
+            "gross_pnl": money,
+            "commissions": money,
+            "net_pnl": money,
+        },
+    )
 
 
-def render_equity_curve(session, account_id: str):
+def render_equity_curve(account_id: str, stamp):
     st.subheader("Equity Curve")
 
+    # Only the chart reports need plotly; Overview/Instruments never load it
+    import plotly.express as px
+
     tz = st.session_state.report_timezone
     use_gross = st.checkbox("Show Gross (vs Net)", value=False)
 
-    equity_curve = MetricsCalculator.get_equity_curve(
-        session=session,
-        account_id=account_id,
-        report_timezone=tz,
-        use_gross=use_gross, 
-    )
+    equity_curve = _equity_curve(account_id, stamp, tz, use_gross)
 
     if equity_curve is None or equity_curve.empty:
         st.info("No trades yet.")
@@ -126,18 +188,13 @@ def render_equity_curve(session, account_id: str):
     st.plotly_chart(fig_daily, use_container_width=True)
 
 
-def render_time_of_day_entry(session, account_id: str):
+def render_time_of_day_entry(account_id: str, stamp):
     st.subheader("Time of Day (Entry)")
 
     tz = st.session_state.report_timezone
     use_gross = st.checkbox("Use Gross P&L (vs Net)", value=False)
 
-    df = MetricsCalculator.get_entry_time_of_day_stats(
-        session=session,
-        account_id=account_id,
-        report_timezone=tz,
-        use_gross=use_gross,
-    )
+    df = _entry_time_of_day_stats(account_id, stamp, tz, use_gross)
 
     if df is None or df.empty:
         st.info("No closed trades yet.")
@@ -146,23 +203,15 @@ def render_time_of_day_entry(session, account_id: str):
     df = df.copy()
     df["hour_label"] = df["hour"].apply(lambda h: f"{h:02d}:00")
 
-    fig_trades = px.bar(
-        df,
-        x="hour_label",
-        y="trades",
-        title="Trades by Entry Hour",
-        labels={"hour_label": "Entry Hour", "trades": "Number of Trades"},
+    hours = df["hour_label"].to_numpy()
+    fig_trades = _bar(
+        hours, df["trades"].to_numpy(), "Trades by Entry Hour", "Entry Hour", "Number of Trades"
     )
     st.plotly_chart(fig_trades, use_container_width=True)
 
-    fig_pnl = px.bar(
-        df,
-        x="hour_label",
-        y="pnl_sum",
-        title="P&L by Entry Hour",
-        labels={"hour_label": "Entry Hour", "pnl_sum": "Total P&L ($)"},
-        color="pnl_sum",
-        color_continuous_scale=["red", "green"],
+    fig_pnl = _bar(
+        hours, df["pnl_sum"].to_numpy(), "P&L by Entry Hour", "Entry Hour", "Total P&L ($)",
+        colored=True,
     )
     st.plotly_chart(fig_pnl, use_container_width=True)
 
@@ -173,16 +222,12 @@ def render_time_of_day_entry(session, account_id: str):
     )
 
 
-def render_price_levels(session, account_id: str):
+def render_price_levels(account_id: str, stamp):
     st.subheader("Price Level Performance")
 
     use_gross = st.checkbox("Use Gross P&L (vs Net)", value=False)
 
-    df = MetricsCalculator.get_price_bucket_stats(
-        session=session,
-        account_id=account_id,
-        use_gross=use_gross,
-    )
+    df = _price_bucket_stats(account_id, stamp, use_gross)
 
     if df is None or df.empty:
         st.info("No closed trades yet.")
@@ -194,26 +239,32 @@ def render_price_levels(session, account_id: str):
         lambda x: f"${int(x.left)}-${int(x.right)}"
     )
 
-    fig_trades = px.bar(
-        df,
-        x="bucket_label",
-        y="trades",
-        title="Trades by Price Bucket (Avg Entry Price)",
-        labels={"bucket_label": "Avg Entry Price Bucket", "trades": "Number of Trades"},
+    buckets = df["bucket_label"].to_numpy()
+    fig_trades = _bar(
+        buckets,
+        df["trades"].to_numpy(),
+        "Trades by Price Bucket (Avg Entry Price)",
+        "Avg Entry Price Bucket",
+        "Number of Trades",
     )
     st.plotly_chart(fig_trades, use_container_width=True)
 
-    fig_pnl = px.bar(
-        df,
-        x="bucket_label",
-        y="pnl_sum",
-        title="P&L by Price Bucket",
-        labels={"bucket_label": "Avg Entry Price Bucket", "pnl_sum": "Total P&L ($)"},
-        color="pnl_sum",
-        color_continuous_scale=["red", "green"],
+    fig_pnl = _bar(
+        buckets, df["pnl_sum"].to_numpy(), "P&L by Price Bucket", "Avg Entry Price Bucket", "Total P&L ($)",
+        colored=True,
     )
     st.plotly_chart(fig_pnl, use_container_width=True)
 
     df_display = df[["bucket_label", "trades", "pnl_sum", "pnl_avg"]].copy()
     df_display.columns = ["Price Range", "Trades", "Total P&L", "Avg P&L"]
-    st.dataframe(df_display, use_container_width=True, hide_index=True)
\ No newline at end of file
+    st.dataframe(df_display, use_container_width=True, hide_index=True)
+
+
+# Report label -> renderer; also the order of the report selectbox
+_REPORTS = {
+    "Overview": render_overview,
+    "Instrument Performance": render_instrument_stats,
+    "Equity Curve": render_equity_curve,
+    "Time of Day (Entry)": render_time_of_day_entry,
+    "Price Levels": render_price_levels,
+}
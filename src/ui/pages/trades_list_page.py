@@ -1,15 +1,176 @@
 # src/ui/pages/trades_list_page.py
 """Trades list page - all trades with filters."""
 
+import io
+from functools import partial
+
 import streamlit as st
 import pandas as pd
-from sqlmodel import select
+from sqlalchemy import case, func
+from sqlmodel import Session, select
+from datetime import datetime, time, timedelta, timezone, date
 from zoneinfo import ZoneInfo
-from datetime import timezone as dt_timezone, date
 
 from src.db.models import Trade
-from src.db.session import get_session
-from src.ui.helpers.current_context import require_account_id
+from src.db.session import get_engine, get_session
+from src.ui.helpers.current_context import data_version, require_account_id
+
+# "Sort by" label -> column
+_SORT_COLUMNS = {
+    "Opened": Trade.opened_at_utc,
+    "Net P&L": Trade.net_pnl_total,
+    "Symbol": Trade.symbol,
+    "Gross P&L": Trade.gross_pnl_total,
+}
+
+
+# Rows per page of the trades table, and per read of the CSV export
+_PAGE_SIZE = 100
+_CSV_CHUNK = 5000
+
+
+def _utc_midnight(day: date, tz: ZoneInfo) -> datetime:
+    """Naive UTC instant at which `day` starts in `tz`, comparable to opened_at_utc."""
+    start = datetime.combine(day, time.min, tzinfo=tz)
+    return start.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _conditions(account_id: str, filters: tuple) -> list:
+    """
+    WHERE clauses for (status, direction, symbols, opened from, opened before,
+    P&L); the two bounds are naive UTC datetimes.
+    """
+    status_filter, direction_filter, symbol_filter, opened_from, opened_before, pnl_filter = filters
+
+    # Filters run in SQL - an empty multiselect means "show all"
+    conds = [Trade.account_id == account_id]
+    if status_filter:
+        conds.append(Trade.status.in_(status_filter))
+    if direction_filter:
+        conds.append(Trade.direction.in_(direction_filter))
+    if symbol_filter:
+        conds.append(Trade.symbol.in_(symbol_filter))
+    # Range on the indexed UTC open time; bounds are local midnights in UTC
+    conds.append(Trade.opened_at_utc >= opened_from)
+    conds.append(Trade.opened_at_utc < opened_before)
+    if pnl_filter == "Winners":
+        conds.append(Trade.net_pnl_total > 0)
+    elif pnl_filter == "Losers":
+        conds.append(Trade.net_pnl_total < 0)
+    return conds
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _trade_summary(account_id: str, stamp, filters: tuple) -> tuple:
+    """
+    (trades, winners, net P&L, commissions) over every trade matching `filters`.
+
+    The trade count also sizes the pager.
+    """
+    with get_session() as session:
+        return tuple(session.exec(
+            select(
+                func.count(),
+                func.coalesce(func.sum(case((Trade.net_pnl_total > 0, 1), else_=0)), 0),
+                func.coalesce(func.sum(Trade.net_pnl_total), 0.0),
+                func.coalesce(func.sum(Trade.commission_total), 0.0),
+            ).where(*_conditions(account_id, filters))
+        ).one())
+
+
+def _trades_stmt(account_id: str, filters: tuple, sort_by: str, ascending: bool):
+    """The table's columns for every trade matching `filters`, in display order."""
+    # Sort in SQL too; ties stay newest-first (then by id) so reruns are stable
+    sort_col = _SORT_COLUMNS[sort_by]
+    return (
+        select(
+            Trade.symbol,
+            Trade.direction,
+            Trade.opened_at_utc,
+            Trade.closed_at_utc,
+            Trade.status,
+            Trade.quantity_opened,
+            Trade.gross_pnl_total,
+            Trade.commission_total,
+            Trade.net_pnl_total,
+        )
+        .where(*_conditions(account_id, filters))
+        .order_by(
+            sort_col.asc() if ascending else sort_col.desc(),
+            Trade.opened_at_utc.desc(),
+            Trade.id,
+        )
+    )
+
+
+def _table(trades: pd.DataFrame, tz_name: str) -> pd.DataFrame:
+    """Rows read by _trades_stmt as the displayed/exported table."""
+    # UTC -> report timezone for the whole column at once; still-open trades
+    # have no close time (NaT), which formats as NaN and becomes "Open".
+    opened = pd.to_datetime(trades["opened_at_utc"], utc=True).dt.tz_convert(tz_name)
+    closed = pd.to_datetime(trades["closed_at_utc"], utc=True).dt.tz_convert(tz_name)
+
+    return pd.DataFrame(
+        {
+            "Symbol": trades["symbol"],
+            "Direction": trades["direction"],
+            "Opened": opened.dt.strftime("%Y-%m-%d %H:%M"),
+            "Closed": closed.dt.strftime("%Y-%m-%d %H:%M").fillna("Open"),
+            "Status": trades["status"],
+            "Qty": trades["quantity_opened"],
+            "Gross P&L": trades["gross_pnl_total"],
+            "Commissions": trades["commission_total"],
+            "Net P&L": trades["net_pnl_total"],
+        }
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _load_trades(
+    account_id: str,
+    stamp,
+    filters: tuple,
+    sort_by: str,
+    ascending: bool,
+    tz_name: str,
+    page: int,
+    page_size: int,
+) -> pd.DataFrame:
+    """
+    Page `page` of the trades table for one filter/sort choice.
+
+    Widget reruns with unchanged choices, and flipping back to an earlier one,
+    skip the DB and the row build.
+    """
+    # Only the page on screen leaves the database
+    stmt = _trades_stmt(account_id, filters, sort_by, ascending)
+    stmt = stmt.limit(page_size).offset((page - 1) * page_size)
+
+    with get_session() as session:
+        # Just the displayed columns, read straight into a DataFrame
+        return _table(pd.read_sql(stmt, session.connection()), tz_name)
+
+
+def _csv_export(
+    engine, account_id: str, filters: tuple, sort_by: str, ascending: bool, tz_name: str
+) -> str:
+    """
+    Every filtered trade as CSV, read and written _CSV_CHUNK rows at a time,
+    so the full result never sits in one DataFrame.
+
+    Runs when the export button is clicked, outside the script run, where
+    session_state is unavailable; hence the explicit engine.
+    """
+    out = io.StringIO()
+    with Session(engine) as session:
+        chunks = pd.read_sql(
+            _trades_stmt(account_id, filters, sort_by, ascending),
+            session.connection(),
+            chunksize=_CSV_CHUNK,
+        )
+        for i, chunk in enumerate(chunks):
+            _table(chunk, tz_name).to_csv(out, index=False, header=i == 0)
+    return out.getvalue()
 
 
 def render():
@@ -18,26 +179,29 @@ def render():
 
     account_id = require_account_id()
 
-    # Get all trades
+    # Filter choices: open-time range and distinct symbols
     with get_session() as session:
-        stmt = (
-            select(Trade)
+        first_opened, last_opened = session.exec(
+            select(func.min(Trade.opened_at_utc), func.max(Trade.opened_at_utc))
             .where(Trade.account_id == account_id)
-            .order_by(Trade.opened_at_utc.desc())
-        )
-        trades = session.exec(stmt).all()
+        ).one()
+        unique_symbols = list(session.exec(
+            select(Trade.symbol)
+            .where(Trade.account_id == account_id)
+            .distinct()
+            .order_by(Trade.symbol)
+        ).all())
 
-    if not trades:
+    if not unique_symbols:
         st.info("No trades yet. Import IBKR data first.")
         return
 
-    # Get unique symbols
-    unique_symbols = sorted(list(set(t.symbol for t in trades)))
-
-    # Get date range from trades
-    all_dates = [t.opened_at_utc.date() for t in trades if t.opened_at_utc]
-    min_date = min(all_dates) if all_dates else date.today()
-    max_date = max(all_dates) if all_dates else date.today()
+    # Date range of the trades, as opening days in the report timezone - the
+    # same days the Opened column shows
+    tz_name = st.session_state.get("report_timezone", "US/Eastern")
+    tz = ZoneInfo(tz_name)
+    min_date = first_opened.replace(tzinfo=timezone.utc).astimezone(tz).date()
+    max_date = last_opened.replace(tzinfo=timezone.utc).astimezone(tz).date()
 
     # Filters row 1
     col1, col2, col3 = st.columns(3)
@@ -88,93 +252,62 @@ def render():
             max_value=max_date,
         )
 
-        # Apply filters - handle empty lists as "show all"
-    filtered_trades = []
-    
-    for t in trades:
-        # If filter is empty, treat as "all selected"
-        if status_filter and t.status not in status_filter:
-            continue
-        if direction_filter and t.direction not in direction_filter:
-            continue
-        if symbol_filter and t.symbol not in symbol_filter:
-            continue
-        if t.opened_at_utc.date() < start_date or t.opened_at_utc.date() > end_date:
-            continue
-        
-        filtered_trades.append(t)
-
-    # Apply P&L filter
-    if pnl_filter == "Winners":
-        filtered_trades = [t for t in filtered_trades if t.net_pnl_total > 0]
-    elif pnl_filter == "Losers":
-        filtered_trades = [t for t in filtered_trades if t.net_pnl_total < 0]
-
-
-    # Get timezone
-    tz_name = st.session_state.get("report_timezone", "US/Eastern")
-    tz_obj = ZoneInfo(tz_name)
-
-    # Build table
-    rows = []
-    for trade in filtered_trades:
-        # Convert UTC to local timezone
-        opened_utc = trade.opened_at_utc.replace(tzinfo=dt_timezone.utc)
-        opened_local = opened_utc.astimezone(tz_obj)
-        
-        if trade.closed_at_utc:
-            closed_utc = trade.closed_at_utc.replace(tzinfo=dt_timezone.utc)
-            closed_local = closed_utc.astimezone(tz_obj)
-            closed_display = closed_local.strftime("%Y-%m-%d %H:%M")
-        else:
-            closed_display = "Open"
-        
-        rows.append({
-            "Symbol": trade.symbol,
-            "Direction": trade.direction,
-            "Opened": opened_local.strftime("%Y-%m-%d %H:%M"),
-            "Closed": closed_display,
-            "Status": trade.status,
-            "Qty": trade.quantity_opened,
-            "Gross P&L": trade.gross_pnl_total,
-            "Commissions": trade.commission_total,
-            "Net P&L": trade.net_pnl_total,
-        })
-
-    df = pd.DataFrame(rows)
-    
     # Add sorting controls
     col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
         sort_by = st.selectbox(
             "Sort by",
-            ["Opened", "Net P&L", "Symbol", "Gross P&L"],
+            list(_SORT_COLUMNS),
             index=0,
         )
     with col2:
         sort_order = st.selectbox("Order", ["Descending", "Ascending"])
-    
-    # Sort dataframe
-    ascending = (sort_order == "Ascending")
-    df = df.sort_values(by=sort_by, ascending=ascending)
-    
-    # Format currency columns for display
-    df_display = df.copy()
-    df_display["Gross P&L"] = df_display["Gross P&L"].apply(lambda x: f"${x:.2f}")
-    df_display["Commissions"] = df_display["Commissions"].apply(lambda x: f"${x:.2f}")
-    df_display["Net P&L"] = df_display["Net P&L"].apply(lambda x: f"${x:.2f}")
-
-    # CSV Export button
-    if not df.empty:
-        csv = df.to_csv(index=False)
+
+    stamp = data_version(account_id)
+    filters = (
+        tuple(sorted(status_filter)),
+        tuple(sorted(direction_filter)),
+        tuple(sorted(symbol_filter)),
+        _utc_midnight(start_date, tz),
+        _utc_midnight(end_date + timedelta(days=1), tz),
+        pnl_filter,
+    )
+    total_trades, winners, total_pnl, total_commissions = _trade_summary(
+        account_id, stamp, filters
+    )
+
+    # Server-side paging: the table only ever holds one page of rows
+    pages = max(1, -(-total_trades // _PAGE_SIZE))
+    with col3:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1)
+
+    ascending = sort_order == "Ascending"
+    df = _load_trades(
+        account_id, stamp, filters, sort_by, ascending, tz_name, page, _PAGE_SIZE
+    )
+
+    # CSV Export button - every filtered trade; the file is built on click
+    if total_trades:
         st.download_button(
             label="📥 Export to CSV",
-            data=csv,
+            data=partial(
+                _csv_export, get_engine(), account_id, filters, sort_by, ascending, tz_name
+            ),
             file_name=f"trades_{start_date}_{end_date}.csv",
             mime="text/csv",
         )
 
-    st.dataframe(df_display, use_container_width=True, hide_index=True)
+    # Numeric columns, formatted by the grid (so they sort by value)
+    money = st.column_config.NumberColumn(format="$%.2f")
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Gross P&L": money, "Commissions": money, "Net P&L": money},
+    )
+    if pages > 1:
+        first = (page - 1) * _PAGE_SIZE
+        st.caption(f"Trades {first + 1}-{first + len(df)} of {total_trades}")
 
     # Summary metrics
     st.divider()
@@ -182,11 +315,6 @@ def render():
 
     col1, col2, col3, col4 = st.columns(4)
 
-    total_trades = len(filtered_trades)
-    winners = sum(1 for t in filtered_trades if t.net_pnl_total > 0)
-    total_pnl = sum(t.net_pnl_total for t in filtered_trades)
-    total_commissions = sum(t.commission_total for t in filtered_trades)
-
     col1.metric("Total Trades", total_trades)
     col2.metric("Winning Trades", winners)
     col3.metric("Total P&L", f"${total_pnl:.2f}")
@@ -58,10 +58,11 @@ def parsed_executions(sample_xml):
     return IBKRFlexParser.parse_xml(sample_xml)
 
 
-@pytest.fixture()
-def session():
-    # In-memory DB session for reconstructor tests.
-    from sqlmodel import SQLModel, Session, create_engine
+@pytest.fixture(scope="session")
+def engine():
+    # One in-memory DB (and one create_all) for the whole test run.
+    from sqlmodel import SQLModel, create_engine
+    from sqlalchemy import event
     from sqlalchemy.pool import StaticPool
 
     # Import models so tables are registered on SQLModel.metadata.
@@ -72,7 +73,30 @@ def session():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+
+    # pysqlite's own transaction handling breaks SAVEPOINTs; let SQLAlchemy
+    # emit BEGIN itself so the per-test rollback below really isolates tests.
+    @event.listens_for(engine, "connect")
+    def _no_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture()
+def session(engine):
+    # In-memory DB session for reconstructor tests. Runs inside a transaction
+    # that is rolled back afterwards; the code under test's commit() calls
+    # only release savepoints, so every test starts from empty tables.
+    from sqlmodel import Session
 
-    with Session(engine) as s:
-        yield s
+    with engine.connect() as conn:
+        trans = conn.begin()
+        with Session(bind=conn, join_transaction_mode="create_savepoint") as s:
+            yield s
+        trans.rollback()
@@ -0,0 +1,51 @@
+# tests/test_epoch_micros.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import BigInteger, Column, MetaData, Table, insert, select
+
+from src.db.models import EpochMicros
+
+
+def test_epoch_micros_binds_integers():
+    t = EpochMicros()
+    assert t.process_bind_param(None, None) is None
+    assert t.process_result_value(None, None) is None
+    assert t.process_bind_param(datetime(1970, 1, 1, 0, 0, 1, 5), None) == 1_000_005
+    assert t.process_bind_param(datetime(1969, 12, 31, 23, 59, 59), None) == -1_000_000
+
+
+def test_epoch_micros_round_trip(session):
+    table = Table(
+        "epoch_micros_roundtrip",
+        MetaData(),
+        Column("id", BigInteger, primary_key=True),
+        Column("ts", EpochMicros()),
+    )
+    conn = session.connection()
+    table.create(conn)
+
+    values = {
+        # Naive values are already UTC and come back unchanged, microseconds included
+        1: datetime(2025, 1, 2, 14, 30, 0, 123456),
+        # Aware values are converted to UTC and stored naive
+        2: datetime(2025, 7, 1, 9, 30, 0, 999999, tzinfo=ZoneInfo("US/Eastern")),
+        3: datetime(2025, 1, 2, 22, 0, 0, 1, tzinfo=timezone(timedelta(hours=8))),
+        4: None,
+    }
+    conn.execute(insert(table), [{"id": k, "ts": v} for k, v in values.items()])
+
+    stored = dict(conn.execute(select(table.c.id, table.c.ts)).all())
+    assert stored == {
+        1: datetime(2025, 1, 2, 14, 30, 0, 123456),
+        2: datetime(2025, 7, 1, 13, 30, 0, 999999),
+        3: datetime(2025, 1, 2, 14, 0, 0, 1),
+        4: None,
+    }
+    assert all(v is None or v.tzinfo is None for v in stored.values())
+
+    # Stored as plain integer microseconds since the epoch
+    raw = conn.exec_driver_sql("SELECT ts FROM epoch_micros_roundtrip WHERE id = 1").scalar()
+    assert raw == 1_735_828_200_123_456
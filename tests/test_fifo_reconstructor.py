@@ -1,10 +1,10 @@
 # tests/test_fifo_reconstructor.py
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from sqlmodel import select
 
-from src.db.models import Account, Execution, Trade, TradeDay
+from src.db.models import Account, Execution, Trade, TradeDay, TradeExecution
 from src.domain.reconstructor import TradeReconstructor
 
 
@@ -93,3 +93,144 @@ def test_fifo_realized_pnl_correctness(session):
     assert round(td.commissions, 6) == -3.5
     assert round(td.realized_net, 6) == 246.5
     assert td.day_status in ("adjusted", "closed")
+
+
+def test_reconstruction_is_idempotent(session):
+    acct = Account(account_number="U7654321", currency="USD")
+    session.add(acct)
+    session.commit()
+    session.refresh(acct)
+
+    for i, (side, price) in enumerate([("BUY", 100.0), ("SELL", 105.0)]):
+        session.add(
+            Execution(
+                account_id=acct.id,
+                ib_execution_id=f"R{i}",
+                conid=1,
+                symbol="MSFT",
+                ts_utc=datetime(2025, 1, 2, 15, i, 0),
+                ts_raw="",
+                side=side,
+                quantity=10.0,
+                price=price,
+                commission=-1.0,
+            )
+        )
+    session.commit()
+
+    first = TradeReconstructor.reconstruct_for_account(session, acct.id)
+    second = TradeReconstructor.reconstruct_for_account(session, acct.id)
+    assert first == second == (1, 1)
+
+    # The rebuild must replace, not add to, the previous trades and their children.
+    assert len(session.exec(select(Trade)).all()) == 1
+    assert len(session.exec(select(TradeDay)).all()) == 1
+    assert len(session.exec(select(TradeExecution)).all()) == 2
+
+
+def test_weekend_fill_rolls_back_across_month_start(session):
+    acct = Account(account_number="U2468135", currency="USD")
+    session.add(acct)
+    session.commit()
+    session.refresh(acct)
+
+    # Friday 2025-01-31 buy, Saturday 2025-02-01 sell: the close books to Friday.
+    for i, (ts, side, price) in enumerate(
+        [(datetime(2025, 1, 31, 15, 0, 0), "BUY", 100.0), (datetime(2025, 2, 1, 15, 0, 0), "SELL", 104.0)]
+    ):
+        session.add(
+            Execution(
+                account_id=acct.id,
+                ib_execution_id=f"W{i}",
+                conid=2,
+                symbol="SPY",
+                ts_utc=ts,
+                ts_raw="",
+                side=side,
+                quantity=10.0,
+                price=price,
+                commission=-1.0,
+            )
+        )
+    session.commit()
+
+    assert TradeReconstructor.reconstruct_for_account(session, acct.id, "US/Eastern") == (1, 1)
+
+    trade = session.exec(select(Trade)).one()
+    assert trade.status == "closed"
+    assert round(trade.gross_pnl_total, 6) == 40.0
+
+    td = session.exec(select(TradeDay)).one()
+    assert td.day_date_local == date(2025, 1, 31)
+    assert td.shares_closed == 10.0
+
+
+def test_parallel_reconstruction_matches_serial(session, monkeypatch):
+    import random
+
+    import src.domain.reconstructor as reconstructor
+
+    acct = Account(account_number="U1111111", currency="USD")
+    session.add(acct)
+    session.commit()
+    session.refresh(acct)
+
+    rng = random.Random(7)
+    for i in range(200):
+        k = i % 3
+        session.add(
+            Execution(
+                account_id=acct.id,
+                ib_execution_id=f"P{i:03d}",
+                conid=100 + k,
+                symbol=f"SYM{k}",
+                ts_utc=datetime(2025, 1, 2, 14, 30) + timedelta(minutes=37 * i),
+                ts_raw="",
+                side=rng.choice(["BUY", "SELL"]),
+                quantity=float(rng.randint(1, 8) * 5),
+                price=round(100 + rng.random() * 10, 2),
+                commission=-0.5,
+            )
+        )
+    session.commit()
+
+    def snapshot():
+        trades = session.exec(select(Trade)).all()
+        by_id = {t.id: t for t in trades}
+        key = lambda t: (t.symbol, t.opened_at_utc, t.quantity_opened)
+        return (
+            sorted(
+                (t.symbol, t.direction, t.opened_at_utc, t.closed_at_utc, t.status,
+                 t.quantity_opened, t.quantity_closed, round(t.gross_pnl_total, 6),
+                 round(t.commission_total, 6))
+                for t in trades
+            ),
+            sorted(
+                (key(by_id[d.trade_id]), d.day_date_local, round(d.realized_net, 6), d.shares_closed)
+                for d in session.exec(select(TradeDay)).all()
+            ),
+            sorted(
+                (key(by_id[x.trade_id]), x.execution_id, x.signed_qty, x.role)
+                for x in session.exec(select(TradeExecution)).all()
+            ),
+        )
+
+    serial_counts = TradeReconstructor.reconstruct_for_account(session, acct.id)
+    serial = snapshot()
+
+    # Force the process pool, even on a single-CPU runner
+    monkeypatch.setattr(reconstructor, "_PARALLEL_MIN_EXECUTIONS", 0)
+    monkeypatch.setattr(reconstructor, "_usable_cpus", lambda: 2)
+    pools = []
+
+    class RecordingPool(reconstructor.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(reconstructor, "ProcessPoolExecutor", RecordingPool)
+    parallel_counts = TradeReconstructor.reconstruct_for_account(session, acct.id)
+
+    assert pools and pools[0]["mp_context"].get_start_method() == "spawn"
+    assert parallel_counts == serial_counts
+    assert snapshot() == serial
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sqlmodel import select
+
+from src.db.models import Account, Execution
+from src.io.importer import IBKRImporter
+
+
+def test_import_executions_is_idempotent(session, parsed_executions):
+    acct = Account(account_number="U1234567", currency="USD")
+    session.add(acct)
+    session.commit()
+    session.refresh(acct)
+
+    total, new, warnings = IBKRImporter.import_executions(session, acct, parsed_executions)
+    assert (total, new, warnings) == (2, 2, [])
+
+    rows = session.exec(select(Execution).where(Execution.account_id == acct.id)).all()
+    assert sorted(e.ib_execution_id for e in rows) == ["0000a1", "0000a2"]
+    assert all(e.id for e in rows)
+
+    # Re-importing the same file inserts nothing new.
+    total, new, warnings = IBKRImporter.import_executions(session, acct, parsed_executions)
+    assert (total, new) == (2, 0)
+    assert len(warnings) == 2
@@ -1,7 +1,7 @@
 # tests/test_parser.py
 from __future__ import annotations
 
-import pytz
+from datetime import timezone
 
 
 def test_parse_xml_smoke(parsed_executions):
@@ -21,9 +21,45 @@ def test_parse_xml_smoke(parsed_executions):
     assert e0.order_type == "LMT"
     assert e0.order_time_utc is not None
     assert e0.ts_utc.tzinfo is not None
-    assert e0.ts_utc.tzinfo == pytz.UTC
+    assert e0.ts_utc.tzinfo == timezone.utc
 
     e1 = parsed_executions[1]
     assert e1.ib_execution_id == "0000a2"
     assert e1.side == "SELL"
     assert e1.quantity == 5.0
+
+
+def test_parse_xml_tolerates_invalid_utf8(sample_xml):
+    from src.io.ibkr_flex_parser import IBKRFlexParser
+
+    # One Latin-1 byte in a file that declares UTF-8
+    xml_bytes = sample_xml.replace('exchange="NASDAQ"', 'exchange="NASDAQ \xc9"', 1).encode("latin-1")
+
+    executions = IBKRFlexParser.parse_xml(xml_bytes)
+
+    assert len(executions) == 2
+    assert executions[0].exchange == "NASDAQ �"
+
+
+def test_parse_xml_stream_tolerates_invalid_utf8(sample_xml):
+    import io
+
+    from src.io.ibkr_flex_parser import IBKRFlexParser
+
+    xml_bytes = sample_xml.replace('exchange="NASDAQ"', 'exchange="NASDAQ \xc9"', 1).encode("latin-1")
+
+    executions = IBKRFlexParser.parse_xml_stream(io.BytesIO(xml_bytes))
+
+    assert [e.ib_execution_id for e in executions] == ["0000a1", "0000a2"]
+
+
+def test_parse_xml_stream_raises_on_malformed_xml(sample_xml):
+    import io
+
+    import pytest
+    from xml.parsers.expat import ExpatError
+
+    from src.io.ibkr_flex_parser import IBKRFlexParser
+
+    with pytest.raises(ExpatError):
+        IBKRFlexParser.parse_xml_stream(io.BytesIO(sample_xml[:-30].encode()))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from src.domain.models import PositionState
+
+
+def test_consume_is_fifo_across_lots_and_growth():
+    pos = PositionState()
+
+    # More lots than the initial capacity to exercise growth/compaction.
+    for i in range(20):
+        pos.append_lot(10.0, 100.0 + i)
+    assert pos.open_qty == 200.0
+
+    # Consume two whole lots and half of the third: 10@100 + 10@101 + 5@102
+    matched, cost = pos.consume(25.0)
+    assert matched == 25.0
+    assert round(cost, 6) == 10 * 100.0 + 10 * 101.0 + 5 * 102.0
+    assert pos.lot_price[pos.head] == 102.0
+    assert pos.open_qty == 175.0
+
+    # Draining everything resets the queue.
+    matched, _ = pos.consume(1_000.0)
+    assert matched == 175.0
+    assert not pos.has_lots
+    assert (pos.head, pos.tail) == (0, 0)
+
+
+def test_position_state_is_slotted():
+    # The reconstructor touches these attributes per fill; no per-instance __dict__
+    pos = PositionState.with_capacity(4)
+    assert not hasattr(pos, "__dict__")
@@ -0,0 +1,58 @@
+# tests/test_trades_list_filters.py
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlmodel import select
+
+from src.db.models import Account, Trade
+from src.ui.pages.trades_list_page import _conditions, _utc_midnight
+
+ET = ZoneInfo("US/Eastern")
+
+
+def _symbols_opened_on(session, account_id, day):
+    filters = ((), (), (), _utc_midnight(day, ET), _utc_midnight(day + timedelta(days=1), ET), "All")
+    stmt = select(Trade.symbol).where(*_conditions(account_id, filters)).order_by(Trade.symbol)
+    return session.exec(stmt).all()
+
+
+def test_utc_midnight_across_dst():
+    # EST (UTC-5) before the 2025-03-09 spring-forward, EDT (UTC-4) after it
+    assert _utc_midnight(date(2025, 3, 8), ET) == datetime(2025, 3, 8, 5, 0)
+    assert _utc_midnight(date(2025, 3, 9), ET) == datetime(2025, 3, 9, 5, 0)
+    assert _utc_midnight(date(2025, 3, 10), ET) == datetime(2025, 3, 10, 4, 0)
+    # Back to EST after the 2025-11-02 fall-back
+    assert _utc_midnight(date(2025, 11, 3), ET) == datetime(2025, 11, 3, 5, 0)
+
+
+def test_date_filter_uses_report_timezone_days(session):
+    acct = Account(account_number="U2222222", currency="USD")
+    session.add(acct)
+    session.commit()
+    session.refresh(acct)
+
+    opened = {
+        "LATE": datetime(2025, 1, 6, 4, 30),  # 2025-01-05 23:30 EST, already Jan 6 in UTC
+        "NEXT": datetime(2025, 1, 6, 5, 0),  # 2025-01-06 00:00 EST
+        "DST_LATE": datetime(2025, 3, 10, 3, 30),  # 2025-03-09 23:30 EDT (23-hour day)
+        "DST_EARLY": datetime(2025, 3, 9, 5, 0),  # 2025-03-09 00:00 EST
+        "DST_BEFORE": datetime(2025, 3, 9, 4, 59),  # 2025-03-08 23:59 EST
+    }
+    for symbol, ts in opened.items():
+        session.add(
+            Trade(
+                account_id=acct.id,
+                symbol=symbol,
+                direction="LONG",
+                opened_at_utc=ts,
+                quantity_opened=1.0,
+            )
+        )
+    session.commit()
+
+    assert _symbols_opened_on(session, acct.id, date(2025, 1, 5)) == ["LATE"]
+    assert _symbols_opened_on(session, acct.id, date(2025, 1, 6)) == ["NEXT"]
+    assert _symbols_opened_on(session, acct.id, date(2025, 3, 9)) == ["DST_EARLY", "DST_LATE"]
+    assert _symbols_opened_on(session, acct.id, date(2025, 3, 8)) == ["DST_BEFORE"]